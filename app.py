@@ -3,6 +3,7 @@ from flask_cors import CORS
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
 from models.news_models import NewsModel
+from models.db import PoolExhaustedError
 from routes.news_routes import news_bp
 from services.scheduler import (
     midnight_job,
@@ -20,7 +21,11 @@ from services.scheduler import (
     cleanup_job
 )
 from config import Config
-from services.init_db import init_database, verify_tables
+from services.init_db import init_database
+from utils.json_render import json_response, sql_render_enabled
+from utils.json_provider import create_json_provider
+from services import change_feed
+from services.http_cache import cached_response, conditional_response, compress_response
 import os
 import time
 import logging
@@ -37,6 +42,7 @@ logger = logging.getLogger(__name__)
 def create_app():
     app = Flask(__name__)
     app.config.from_object(Config)
+    app.json = create_json_provider(app, Config.JSON_BACKEND)
 
     CORS(app, resources={r"/*": {"origins": "*"}})
 
@@ -46,28 +52,21 @@ def create_app():
         app=app
     )
 
-    try:
-        init_database()
-        verify_tables()
+    # news, scraping_blacklist, api_usage ve system_info migration'larla yönetilir;
+    # şema güncelse bu sadece tek bir versiyon sorgusudur
+    if init_database():
         logger.info("✅ Veritabanı başlatma tamamlandı")
-    except Exception as e:
-        logger.error(f"❌ init_database hatası: {e}")
-
-    try:
-        NewsModel.create_table()
-        logger.info("✅ NewsModel tabloları hazır")
-    except Exception as e:
-        logger.error(f"❌ NewsModel tablo hatası: {e}")
-
-    try:
-        from models.system_models import SystemModel
-        SystemModel.init_table()
-        logger.info("✅ SystemInfo tablosu hazır")
-    except Exception as e:
-        logger.error(f"❌ SystemInfo tablo hatası: {e}")
 
     app.register_blueprint(news_bp)
 
+    @app.before_request
+    def start_change_feed():
+        # gunicorn fork'undan sonra her worker kendi listener'ını açar
+        change_feed.ensure_listener()
+
+    # JSON yanıtları Accept-Encoding'e göre sıkıştırılır (Config.COMPRESSION_*)
+    app.after_request(compress_response)
+
     @app.route("/health", methods=["GET", "HEAD"])
     def health():
         return jsonify({
@@ -159,20 +158,31 @@ def create_app():
 
     @app.route("/news", methods=["GET"])
     @limiter.limit("60 per minute")
+    @cached_response
     def get_news():
         try:
             category = request.args.get("category")
             limit = min(int(request.args.get("limit", 50)), Config.MAX_NEWS_PER_PAGE)
             offset = int(request.args.get("offset", 0))
+            cursor = request.args.get("cursor")
+            view = request.args.get("view", "full")
 
-            data = NewsModel.get_news(category, limit, offset)
+            page = NewsModel.get_news_page(
+                category, limit, offset, cursor=cursor, view=view,
+                sql_render=sql_render_enabled()
+            )
 
-            return jsonify({
+            return json_response({
                 "success": True,
-                "count": len(data),
-                "news": data
+                "count": page["count"],
+                "next_cursor": page["next_cursor"],
+                "news": page["news"]
             })
 
+        except ValueError as e:
+            return jsonify({"success": False, "error": str(e)}), 400
+        except PoolExhaustedError:
+            raise
         except Exception as e:
             logger.exception("❌ /news hatası")
             return jsonify({"success": False, "error": str(e)}), 500
@@ -186,15 +196,21 @@ def create_app():
                 "last_update": ts.isoformat() if ts else None,
                 "timestamp": datetime.now(pytz.UTC).isoformat()
             })
+        except PoolExhaustedError:
+            raise
         except Exception as e:
             logger.exception("❌ /news/last-update")
             return jsonify({"success": False, "error": str(e)}), 500
 
     @app.route("/news/stats", methods=["GET"])
+    @conditional_response
     def stats():
         try:
-            out = {cat: NewsModel.count_by_category(cat) for cat in Config.NEWS_CATEGORIES}
+            by_category = NewsModel.get_stats()["by_category"]
+            out = {cat: by_category[cat]["total"] for cat in Config.NEWS_CATEGORIES}
             return jsonify({"success": True, "stats": out, "total": sum(out.values())})
+        except PoolExhaustedError:
+            raise
         except Exception as e:
             logger.exception("❌ /news/stats")
             return jsonify({"success": False, "error": str(e)}), 500
@@ -225,12 +241,25 @@ def create_app():
                 "/api/news/scraped",
                 "/api/news/scraped/after",
                 "/api/news/scraped/stats",
+                "/api/news/search?q=",
+                "/api/news/<id>",
                 "/api/news/force-fill",
                 "/api/usage",
                 "/cron?key=SECRET"
             ]
         }), 404
 
+    @app.errorhandler(PoolExhaustedError)
+    def error_pool_exhausted(e):
+        logger.warning(f"⚠️  503 döndürüldü: {e}")
+        response = jsonify({
+            "success": False,
+            "error": "service_unavailable",
+            "message": "Veritabanı bağlantı havuzu dolu, lütfen tekrar deneyin"
+        })
+        response.headers["Retry-After"] = "1"
+        return response, 503
+
     @app.errorhandler(500)
     def error_500(e):
         return jsonify({
@@ -0,0 +1,467 @@
+"""
+Async giriş noktası: uvicorn asgi:app
+
+/news, /api/news/scraped ve /api/news/scraped/after asyncio + asyncpg ile
+thread tutmadan servis edilir; diğer tüm yollar Flask uygulamasına (WSGI) gider.
+JSON çıktısı Flask route'larının çıktısıyla byte-byte aynıdır (SQL render dahil).
+ETag / 304 kararı, response cache ve sıkıştırılmış varyantlar Flask yoluyla
+ortaktır (services.http_cache): aynı anahtar iki yoldan da okunup yazılır.
+"""
+from asgiref.wsgi import WsgiToAsgi
+from urllib.parse import parse_qs
+from app import app as flask_app
+from models.news_models import NewsModel
+from models.db import PoolExhaustedError, current_read_staleness, read_staleness, replica_within
+from models import async_db
+from services import change_feed, http_cache
+from utils import http_compression
+from utils.json_render import has_raw_json, render_json
+from werkzeug.http import quote_etag
+from config import Config
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+_wsgi_app = WsgiToAsgi(flask_app)
+
+
+class _RateLimiter:
+    """Flask-Limiter'ın (memory, fixed window) async yoldaki karşılığı."""
+
+    def __init__(self, window: int = 60):
+        self.window = window
+        self._hits = {}
+
+    def hit(self, key: tuple, limit: int) -> bool:
+        window_start = int(time.time()) // self.window
+        bucket = self._hits.get(key)
+
+        if bucket is None or bucket[0] != window_start:
+            if len(self._hits) > 10_000:
+                self._hits = {k: v for k, v in self._hits.items() if v[0] == window_start}
+            bucket = [window_start, 0]
+            self._hits[key] = bucket
+
+        bucket[1] += 1
+        return bucket[1] <= limit
+
+
+_limiter = _RateLimiter()
+
+
+def _json_body(obj) -> bytes:
+    # SQL render edilmiş sayfa: json_response ile aynı birleştirme
+    if has_raw_json(obj):
+        return render_json(flask_app.json, obj).encode("utf-8")
+
+    # Flask DefaultJSONProvider.response ile aynı ayarlar (sort_keys, ensure_ascii, "\n")
+    if flask_app.debug:
+        dump_args = {"indent": 2}
+    else:
+        dump_args = {"separators": (",", ":")}
+    return f"{flask_app.json.dumps(obj, **dump_args)}\n".encode("utf-8")
+
+
+def _json_headers(body: bytes) -> list:
+    return [
+        (b"content-type", b"application/json"),
+        (b"content-length", str(len(body)).encode("ascii")),
+        (b"access-control-allow-origin", b"*"),
+    ]
+
+
+async def _send_json(send, obj, status: int = 200, extra_headers: list = None):
+    body = _json_body(obj)
+    headers = _json_headers(body)
+    headers.extend(extra_headers or [])
+
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _send_not_modified(send, headers: list):
+    await send({
+        "type": "http.response.start",
+        "status": 304,
+        "headers": [(b"access-control-allow-origin", b"*")] + headers
+    })
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _send_ok(send, body: bytes, response_headers: list, validator_headers: list,
+                   etag: str, accept_encoding: str, entry=None):
+    """
+    200 yanıtını validator header'larıyla gönderir; gövde Accept-Encoding'e göre
+    sıkıştırılır (Flask'taki compress_response ile aynı kurallar). entry (cache
+    kaydı) verilirse sıkıştırılmış varyant kayıtta saklanır / oradan okunur.
+    """
+    extra = list(validator_headers)
+    encoding = None
+    if http_compression.should_compress(body):
+        encoding = http_compression.negotiate(accept_encoding)
+
+    if encoding:
+        if entry is not None:
+            body = entry.variants.get(encoding) or await asyncio.to_thread(entry.variant, encoding)
+        else:
+            body = await asyncio.to_thread(http_compression.compress_body, body, encoding)
+
+        response_headers = [(k, v) for k, v in response_headers if k != b"content-length"]
+        response_headers += [
+            (b"content-length", str(len(body)).encode("ascii")),
+            (b"content-encoding", encoding.encode("ascii")),
+        ]
+        tagged = quote_etag(http_compression.encoded_etag(etag, encoding))
+        extra = [(k, tagged.encode("latin-1") if k == b"etag" else v) for k, v in extra]
+
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": response_headers + extra
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def _wrap_send(send, headers: list, etag: str, accept_encoding: str, cache_key=None):
+    """
+    Handler'ın 200 yanıtını _send_ok'a yönlendirir; cache_key verilirse gövde
+    önce response cache'e yazılır (Flask'taki cached_response gibi).
+    """
+    start = None
+
+    async def wrapped(message):
+        nonlocal start
+
+        if message["type"] == "http.response.start":
+            start = message
+            return
+
+        if message["type"] != "http.response.body" or start is None:
+            await send(message)
+            return
+
+        response_headers = list(start["headers"])
+        status = start["status"]
+        start = None
+
+        if cache_key is not None:
+            response_headers.append((b"x-cache", b"MISS"))
+
+        if status != 200:
+            await send({"type": "http.response.start", "status": status, "headers": response_headers})
+            await send(message)
+            return
+
+        body = message.get("body", b"")
+        entry = None
+        if cache_key is not None:
+            entry = http_cache.cache_put(cache_key, body, "application/json")
+
+        await _send_ok(send, body, response_headers, headers, etag, accept_encoding, entry)
+
+    return wrapped
+
+
+def _arg(args: dict, name: str, default=None):
+    values = args.get(name)
+    return values[0] if values else default
+
+
+def _arg_int(args: dict, name: str, default: int) -> int:
+    # werkzeug request.args.get(..., type=int) gibi: hatalı değerde default
+    try:
+        return int(_arg(args, name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_session_tz(value):
+    return value.astimezone(async_db.session_tz()) if value is not None else None
+
+
+async def _fetch_page(conditions: list, params: list, limit: int, offset: int = 0,
+                      cursor: str = None, label: str = "liste", view: str = "full") -> dict:
+    """
+    NewsModel._fetch_page'in async karşılığı: {"news", "count", "next_cursor"}.
+    SQL render açıksa news Postgres'te üretilmiş RawJSON olur.
+    """
+    sql_render = Config.SQL_JSON_RENDER and not flask_app.debug
+
+    staleness = current_read_staleness()
+    if Config.DB_READ_URL and staleness is not None:
+        if not await asyncio.to_thread(replica_within, staleness):
+            # asyncpg pool'u replica'da; replica ETag'deki değişikliği henüz
+            # görmemiş olabilir → sync yol (read_staleness ile primary)
+            return await asyncio.to_thread(
+                NewsModel._fetch_page, conditions, params, limit, offset, cursor,
+                label, view, sql_render
+            )
+
+    if NewsModel.use_sql_render(view, sql_render):
+        query, query_params = NewsModel.build_list_json_query(
+            conditions, params, limit, offset, cursor, view
+        )
+        try:
+            rows = await async_db.fetch(query, query_params)
+            docs, count, last_saved_at, last_id, fallback = rows[0]
+            # Cursor, psycopg2 yolundaki gibi oturum diliminde üretilir
+            page = NewsModel.list_json_page(
+                (docs, count, _to_session_tz(last_saved_at), last_id, fallback), limit
+            )
+            if page is not None:
+                return page
+        except PoolExhaustedError:
+            raise
+        except Exception:
+            logger.exception(f"❌ SQL JSON render hatası ({label}, async), Python'a düşülüyor")
+
+    rows = await _fetch_list(conditions, params, limit, offset, cursor, label, view)
+    return {"news": rows, "count": len(rows), "next_cursor": NewsModel.next_cursor(rows, limit)}
+
+
+async def _fetch_list(conditions: list, params: list, limit: int, offset: int = 0,
+                      cursor: str = None, label: str = "liste", view: str = "full"):
+    """NewsModel._fetch_list'in async karşılığı (aynı sorgu, aynı satır formatı)."""
+    query, params = NewsModel.build_list_query(conditions, params, limit, offset, cursor, view)
+
+    try:
+        rows = await async_db.fetch(query, params)
+    except PoolExhaustedError:
+        raise
+    except Exception:
+        logger.exception(f"❌ Haber getirme hatası ({label}, async)")
+        return []
+
+    # _row_to_dict sıkıştırılmış gövdeyi açar; sözlük cache'te yoksa psycopg2
+    # sorgusu da çalıştırır → event loop'u bloklamamak için thread'de
+    return await asyncio.to_thread(_rows_to_dicts, rows, view)
+
+
+def _rows_to_dicts(rows: list, view: str) -> list:
+    return [
+        NewsModel._row_to_dict(
+            tuple(r[:8]) + (_to_session_tz(r[8]), _to_session_tz(r[9])) + tuple(r[10:]),
+            view
+        )
+        for r in rows
+    ]
+
+
+async def news(args: dict, send):
+    try:
+        category = _arg(args, "category")
+        limit = min(int(_arg(args, "limit", 50)), Config.MAX_NEWS_PER_PAGE)
+        offset = int(_arg(args, "offset", 0))
+        cursor = _arg(args, "cursor")
+        view = _arg(args, "view", "full")
+
+        conditions, params = NewsModel.news_filter(category)
+        page = await _fetch_page(conditions, params, limit, offset, cursor,
+                                 label="get_news", view=view)
+
+        await _send_json(send, {
+            "success": True,
+            "count": page["count"],
+            "next_cursor": page["next_cursor"],
+            "news": page["news"]
+        })
+
+    except ValueError as e:
+        await _send_json(send, {"success": False, "error": str(e)}, 400)
+    except PoolExhaustedError:
+        raise
+    except Exception as e:
+        logger.exception("❌ /news hatası")
+        await _send_json(send, {"success": False, "error": str(e)}, 500)
+
+
+async def scraped(args: dict, send):
+    try:
+        limit = _arg_int(args, "limit", 50)
+        offset = _arg_int(args, "offset", 0)
+        category = _arg(args, "category")
+        cursor = _arg(args, "cursor")
+        view = _arg(args, "view", "full")
+
+        if limit > 200:
+            limit = 200
+
+        conditions, params = NewsModel.scraped_filter(category)
+        page = await _fetch_page(
+            conditions, params, limit, offset, cursor, label="get_scraped_only", view=view
+        )
+
+        # Stats process içinde cache'li; cache dolu değilse sorgu thread'de çalışır
+        total_scraped = await asyncio.to_thread(NewsModel.scraped_total, category)
+        next_cursor = page["next_cursor"]
+        if cursor:
+            has_more = next_cursor is not None
+        else:
+            has_more = offset + page["count"] < total_scraped
+
+        logger.info(f"📱 Android request: {page['count']} scrape edilmiş haber döndürüldü")
+
+        await _send_json(send, {
+            "success": True,
+            "count": page["count"],
+            "total_scraped": total_scraped,
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+            "news": page["news"]
+        })
+
+    except ValueError as e:
+        await _send_json(send, {"success": False, "error": str(e)}, 400)
+    except PoolExhaustedError:
+        raise
+    except Exception as e:
+        logger.exception("❌ /scraped endpoint hatası")
+        await _send_json(send, {"success": False, "error": str(e)}, 500)
+
+
+async def scraped_after(args: dict, send):
+    try:
+        after = _arg(args, "after")
+        limit = _arg_int(args, "limit", 50)
+        category = _arg(args, "category")
+        view = _arg(args, "view", "full")
+
+        if not after:
+            await _send_json(send, {
+                "success": False,
+                "error": "Missing required parameter: 'after' (ISO date)"
+            }, 400)
+            return
+
+        if limit > 200:
+            limit = 200
+
+        NewsModel.check_view(view)
+
+        after_dt = NewsModel.parse_after_date(after)
+        if after_dt is None:
+            page = {"news": [], "count": 0, "next_cursor": None}
+        else:
+            conditions, params = NewsModel.scraped_after_filter(after_dt, category)
+            page = await _fetch_page(conditions, params, limit,
+                                     label="get_scraped_after", view=view)
+
+        logger.info(f"📱 Worker request: {after} sonrası {page['count']} yeni haber")
+
+        await _send_json(send, {
+            "success": True,
+            "count": page["count"],
+            "after": after,
+            "news": page["news"]
+        })
+
+    except ValueError as e:
+        await _send_json(send, {
+            "success": False,
+            "error": f"Invalid date format: {str(e)}"
+        }, 400)
+    except PoolExhaustedError:
+        raise
+    except Exception as e:
+        logger.exception("❌ /scraped/after endpoint hatası")
+        await _send_json(send, {"success": False, "error": str(e)}, 500)
+
+
+# path → (handler, dakikalık limit) — app.py'deki limiter ayarlarıyla aynı
+ROUTES = {
+    "/news": (news, 60),
+    "/api/news/scraped": (scraped, Config.RATE_LIMIT_PER_MINUTE),
+    "/api/news/scraped/after": (scraped_after, Config.RATE_LIMIT_PER_MINUTE),
+}
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+
+        if message["type"] == "lifespan.startup":
+            try:
+                await async_db.init_async_pool()
+            except Exception as e:
+                # İlk istekte tekrar denenir
+                logger.error(f"❌ Async pool başlatılamadı: {e}")
+            await send({"type": "lifespan.startup.complete"})
+
+        elif message["type"] == "lifespan.shutdown":
+            await async_db.close_async_pool()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+
+    route = ROUTES.get(scope.get("path")) if scope["type"] == "http" else None
+
+    # HEAD/OPTIONS (CORS preflight) ve diğer tüm yollar Flask'ta
+    if route is None or scope["method"] != "GET":
+        await _wsgi_app(scope, receive, send)
+        return
+
+    handler, limit = route
+    client = scope.get("client") or ("127.0.0.1", 0)
+
+    if not _limiter.hit((scope["path"], client[0]), limit):
+        await _send_json(send, {
+            "error": "rate_limited",
+            "message": f"{limit} per 1 minute"
+        }, 429)
+        return
+
+    args = parse_qs(scope.get("query_string", b"").decode("latin-1"), keep_blank_values=True)
+    request_headers = {k.decode("latin-1").lower(): v.decode("latin-1")
+                       for k, v in scope.get("headers", [])}
+
+    try:
+        change_feed.ensure_listener()
+
+        # last_update okuması DB'ye gidebilir → thread'de
+        key, etag, modified, validator_headers, staleness = await asyncio.to_thread(
+            http_cache.validators,
+            scope["path"],
+            [(k, v) for k, values in args.items() for v in values],
+            _arg(args, "category")
+        )
+        extra_headers = [(k.lower().encode("latin-1"), v.encode("latin-1"))
+                         for k, v in validator_headers.items()]
+
+        matched = http_cache.is_not_modified(etag, modified,
+                                             request_headers.get("if-none-match"),
+                                             request_headers.get("if-modified-since"))
+        if matched:
+            http_cache.record_not_modified()
+            tagged = quote_etag(matched).encode("latin-1")
+            await _send_not_modified(send, [
+                (k, tagged if k == b"etag" else v) for k, v in extra_headers
+            ])
+            return
+
+        accept_encoding = request_headers.get("accept-encoding")
+        use_cache = http_cache.cache_enabled(flask_app.debug)
+
+        entry = http_cache.cache_get(key) if use_cache else None
+        if entry is not None:
+            await _send_ok(send, entry.body, _json_headers(entry.body) + [(b"x-cache", b"HIT")],
+                           extra_headers, etag, accept_encoding, entry)
+            return
+
+        # Task'a özgü context; to_thread çağrıları da bu değeri görür
+        with read_staleness(staleness):
+            await handler(args, _wrap_send(send, extra_headers, etag, accept_encoding,
+                                           cache_key=key if use_cache else None))
+    except PoolExhaustedError as e:
+        logger.warning(f"⚠️  503 döndürüldü: {e}")
+        await _send_json(send, {
+            "success": False,
+            "error": "service_unavailable",
+            "message": "Veritabanı bağlantı havuzu dolu, lütfen tekrar deneyin"
+        }, 503, [(b"retry-after", b"1")])
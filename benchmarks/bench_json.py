@@ -0,0 +1,149 @@
+"""
+Liste sayfası JSON serialize süresi: 50 ve 200 satırlık sayfalar.
+
+    python benchmarks/bench_json.py [--repeat 200]
+
+before : eski yol — satır başına isoformat() + Flask DefaultJSONProvider
+         (stdlib json, ensure_ascii, sort_keys)
+stdlib : utils.json_provider.IsoJSONProvider (datetime'lar provider'da)
+orjson : utils.json_provider.OrjsonProvider (paket kuruluysa)
+
+Her ölçüm DB satırı (tuple) → dict → JSON yolunun tamamını kapsar; satırlar
+sentetiktir, full_content scrape edilmiş haberlere yakın uzunlukta (~4 KB).
+
+Ölçüm (Python 3.11.7, Flask 3.0.0, orjson 3.9.10, 1 vCPU, --repeat 300,
+iki koşunun ikincisi; tek çekirdekte koşular arası sapma ~%30):
+
+     satır      yol  medyan ms   p95 ms       KB
+        50   before      3.336    3.691    369.9
+        50   stdlib      3.534    3.954    369.9
+        50   orjson      0.287    0.364    252.3
+       200   before     16.541   17.848   1479.0
+       200   stdlib     17.221   19.059   1479.0
+       200   orjson      1.364    1.870   1008.9
+
+stdlib provider'ın kazancı serialize değil, model katmanından isoformat()'ın
+kalkmasıdır; süre "before" ile gürültü içinde aynıdır. orjson ~12x hızlıdır
+ve ensure_ascii olmadığı için Türkçe metinde gövde ~%32 küçüktür.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from utils.json_provider import IsoJSONProvider, OrjsonProvider, orjson
+
+WORDS = (
+    "haber ekonomi spor dünya teknoloji sağlık gündem açıklama bakanlık "
+    "toplantı güncelleme çarşamba İstanbul Ankara İzmir şirket yatırım "
+    "büyüme öğrenci üniversite maç galibiyet seçim görüşme ülke"
+).split()
+
+TZ = timezone(timedelta(hours=3))
+
+
+def _text(rng: random.Random, length: int) -> str:
+    parts = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        parts.append(word)
+        size += len(word) + 1
+    return " ".join(parts)
+
+
+def make_rows(count: int, seed: int = 42) -> list:
+    """NewsModel.LIST_COLUMNS sırasında DB satırları."""
+    rng = random.Random(seed)
+    now = datetime(2026, 1, 15, 12, 0, tzinfo=TZ)
+
+    return [
+        (
+            100000 + i,
+            rng.choice(["general", "business", "sports", "technology", "world"]),
+            _text(rng, 80),
+            _text(rng, 200),
+            _text(rng, 4000),
+            f"https://example.com/haber/{100000 + i}",
+            f"https://example.com/img/{100000 + i}.jpg",
+            "Örnek Haber",
+            now - timedelta(minutes=7 * i, microseconds=i),
+            now - timedelta(minutes=5 * i),
+        )
+        for i in range(count)
+    ]
+
+
+def row_to_dict(r, iso: bool) -> dict:
+    """NewsModel._row_to_dict (view=full); iso=True eski satır başına isoformat()."""
+    return {
+        "id": r[0],
+        "category": r[1],
+        "title": r[2],
+        "description": r[3],
+        "full_content": r[4],
+        "url": r[5],
+        "image": r[6],
+        "source": r[7],
+        "published": (r[8].isoformat() if r[8] else None) if iso else r[8],
+        "saved_at": (r[9].isoformat() if r[9] else None) if iso else r[9],
+    }
+
+
+def page(news: list) -> dict:
+    return {"success": True, "count": len(news), "next_cursor": None, "news": news}
+
+
+def timed(fn, repeat: int) -> list:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    iso_provider = IsoJSONProvider(app)
+    orjson_provider = OrjsonProvider(app) if orjson is not None else None
+
+    print(f"repeat={args.repeat}, orjson={'var' if orjson is not None else 'yok'}")
+    print(f"{'satır':>6} {'yol':>8} {'medyan ms':>10} {'p95 ms':>8} {'KB':>8}")
+
+    for count in (50, 200):
+        rows = make_rows(count)
+
+        cases = {
+            "before": lambda: default_provider.response(
+                page([row_to_dict(r, iso=True) for r in rows])).get_data(),
+            "stdlib": lambda: iso_provider.response(
+                page([row_to_dict(r, iso=False) for r in rows])).get_data(),
+        }
+        if orjson_provider is not None:
+            cases["orjson"] = lambda: orjson_provider.response(
+                page([row_to_dict(r, iso=False) for r in rows])).get_data()
+
+        with app.app_context():
+            for name, fn in cases.items():
+                size = len(fn())
+                samples = sorted(timed(fn, args.repeat))
+                p95 = samples[int(len(samples) * 0.95) - 1]
+                print(f"{count:>6} {name:>8} {statistics.median(samples) * 1000:>10.3f} "
+                      f"{p95 * 1000:>8.3f} {size / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import asyncpg
+from datetime import timezone
+from zoneinfo import ZoneInfo
+from config import Config
+from models.db import PoolExhaustedError
+import asyncio
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+_pool = None
+_pool_lock = None
+_session_tz = timezone.utc
+
+_PLACEHOLDER = re.compile(r"%s")
+
+
+def to_asyncpg_query(query: str) -> str:
+    """psycopg2 tarzı %s placeholder'larını asyncpg'nin $1, $2 ... biçimine çevirir."""
+    counter = iter(range(1, 10_000))
+    return _PLACEHOLDER.sub(lambda _: f"${next(counter)}", query)
+
+
+def session_tz():
+    """
+    Async bağlantının TimeZone ayarı. psycopg2 timestamptz değerlerini bu
+    dilimde döndürür; asyncpg UTC döndürdüğü için çıktıyı eşitlemek için kullanılır.
+    """
+    return _session_tz
+
+
+async def _init_session(conn):
+    global _session_tz
+
+    name = await conn.fetchval("SELECT current_setting('TimeZone')")
+    try:
+        _session_tz = ZoneInfo(name)
+    except Exception:
+        logger.warning(f"⚠️  Bilinmeyen TimeZone '{name}', UTC kullanılacak")
+        _session_tz = timezone.utc
+
+
+async def init_async_pool():
+    """Async okuma yolu için asyncpg pool'u (replica tanımlıysa replica'ya) açar."""
+    global _pool, _pool_lock
+
+    if _pool is not None:
+        return _pool
+
+    if _pool_lock is None:
+        _pool_lock = asyncio.Lock()
+
+    async with _pool_lock:
+        if _pool is not None:
+            return _pool
+
+        server_settings = {"statement_timeout": "30000"}
+
+        # libpq PGTZ'yi oturuma uygular, asyncpg uygulamaz
+        if os.getenv("PGTZ"):
+            server_settings["TimeZone"] = os.getenv("PGTZ")
+
+        _pool = await asyncpg.create_pool(
+            dsn=Config.DB_READ_URL or Config.DB_URL,
+            min_size=Config.ASYNC_DB_POOL_MIN,
+            max_size=Config.ASYNC_DB_POOL_MAX,
+            timeout=10,
+            server_settings=server_settings,
+            init=_init_session
+        )
+        logger.info(
+            f"✅ Async connection pool oluşturuldu "
+            f"({Config.ASYNC_DB_POOL_MIN}-{Config.ASYNC_DB_POOL_MAX})"
+        )
+        return _pool
+
+
+async def fetch(query: str, params: list) -> list:
+    """
+    %s placeholder'lı sorguyu async pool üzerinde çalıştırır.
+    Config.DB_POOL_TIMEOUT içinde bağlantı alınamazsa PoolExhaustedError fırlatır.
+    """
+    pool = await init_async_pool()
+
+    try:
+        conn = await pool.acquire(timeout=Config.DB_POOL_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise PoolExhaustedError(
+            f"async pool dolu: {Config.DB_POOL_TIMEOUT}s içinde bağlantı alınamadı"
+        )
+
+    try:
+        return await conn.fetch(to_asyncpg_query(query), *params)
+    finally:
+        await pool.release(conn)
+
+
+async def close_async_pool():
+    global _pool
+
+    if _pool is not None:
+        try:
+            await _pool.close()
+            logger.info("✅ Async connection pool kapatıldı")
+        except Exception as e:
+            logger.error(f"❌ Async pool kapatma hatası: {e}")
+        finally:
+            _pool = None
@@ -1,82 +1,461 @@
 import psycopg2
 from psycopg2 import pool
 from psycopg2.extras import RealDictCursor
+from contextlib import contextmanager
 from config import Config
+import contextvars
 import logging
+import threading
 import time
 
 logger = logging.getLogger(__name__)
 
 _connection_pool = None
+_read_pool = None
+_read_pool_failed_at = 0.0
+_init_lock = threading.Lock()
+
+# Replica gecikmesi (saniye) kısa süre cache'lenir: {"value": float | None, "checked_at": monotonic}
+_replica_lag = {"value": None, "checked_at": 0.0}
+_lag_lock = threading.Lock()
+
+# İstek bazlı tazelik şartı: read_only okumalarda max_staleness verilmemişse
+# bu değer kullanılır (bkz. read_staleness)
+_read_staleness = contextvars.ContextVar("read_staleness", default=None)
+
+
+class PoolExhaustedError(Exception):
+    """Havuzda Config.DB_POOL_TIMEOUT süresi içinde boş bağlantı bulunamadı."""
+
+
+# Bağlantı bekleme süresi histogramı (ms, üst sınırlar)
+WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class _ManagedPool:
+    """
+    ThreadedConnectionPool üzerine:
+    - maxconn kadar slot (bekleme kuyruğu + timeout)
+    - boşta bağlantılar maxconn'a kadar açık tutulur (minconn sadece açılışta)
+    - sadece uzun süre boşta kalmış bağlantılar için SELECT 1 kontrolü
+    - get_pool_status() için canlı telemetri
+
+    Sayaçlar: pool dolduğunda eskisi gibi pool dışı direkt bağlantı açılmaz,
+    PoolExhaustedError fırlatılır ve "exhausted" sayılır. "primary_fallbacks"
+    sadece replica pool'unda artar: okuma replica yerine primary'ye düştü.
+    """
+
+    def __init__(self, name: str, dsn: str, minconn: int, maxconn: int):
+        self.name = name
+        self.minconn = minconn
+        self.maxconn = maxconn
+
+        self._pool = psycopg2.pool.ThreadedConnectionPool(
+            minconn=minconn,
+            maxconn=maxconn,
+            dsn=dsn,
+            connect_timeout=10,
+            options="-c statement_timeout=30000"
+        )
+        # psycopg2 iade edilen bağlantıyı boştakiler minconn'a ulaştıysa kapatır;
+        # yük altında sürekli kapat/aç olmasın diye eşik maxconn'a çekilir
+        self._pool.minconn = maxconn
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._checked_out = set()
+        self._last_used = {}
+        self._created_at = {}
+
+        self._stats = {
+            "checkouts": 0,
+            "checkout_failures": 0,
+            "exhausted": 0,
+            "pings": 0,
+            "ping_failures": 0,
+            "discarded": 0,
+            "primary_fallbacks": 0,
+        }
+        self._wait_histogram = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self._wait_total_ms = 0.0
+        self._wait_max_ms = 0.0
+
+        now = time.monotonic()
+        for conn in getattr(self._pool, "_pool", []):
+            self._created_at[id(conn)] = now
+
+    def _record_wait(self, waited_ms: float):
+        index = len(WAIT_BUCKETS_MS)
+        for i, upper in enumerate(WAIT_BUCKETS_MS):
+            if waited_ms <= upper:
+                index = i
+                break
+
+        with self._lock:
+            self._wait_histogram[index] += 1
+            self._wait_total_ms += waited_ms
+            self._wait_max_ms = max(self._wait_max_ms, waited_ms)
+
+    def _count(self, key: str):
+        with self._lock:
+            self._stats[key] += 1
+
+    def getconn(self):
+        with self._lock:
+            if self._waiting >= Config.DB_POOL_MAX_WAITERS:
+                self._stats["exhausted"] += 1
+                self._stats["checkout_failures"] += 1
+                raise PoolExhaustedError(
+                    f"{self.name} pool dolu: {self._waiting} istek zaten bekliyor"
+                )
+            self._waiting += 1
+
+        started = time.monotonic()
+        try:
+            acquired = self._slots.acquire(timeout=Config.DB_POOL_TIMEOUT)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+        self._record_wait((time.monotonic() - started) * 1000)
+
+        if not acquired:
+            self._count("exhausted")
+            self._count("checkout_failures")
+            raise PoolExhaustedError(
+                f"{self.name} pool dolu: {Config.DB_POOL_TIMEOUT}s içinde bağlantı alınamadı"
+            )
+
+        try:
+            conn = self._checkout_live()
+        except Exception:
+            self._count("checkout_failures")
+            self._slots.release()
+            raise
+
+        with self._lock:
+            self._checked_out.add(id(conn))
+            self._created_at.setdefault(id(conn), time.monotonic())
+            self._stats["checkouts"] += 1
+        return conn
+
+    def _checkout_live(self):
+        last_error = None
+
+        for _ in range(3):
+            conn = self._pool.getconn()
+
+            if conn.closed:
+                logger.warning("⚠️  Bağlantı kapalı, yeniden açılıyor...")
+                self._discard(conn)
+                continue
+
+            # Hiç görülmemiş bağlantıyı psycopg2 az önce açtı: canlı sayılır
+            with self._lock:
+                last_used = self._last_used.get(id(conn)) or self._created_at.get(id(conn))
+                if last_used is None:
+                    self._created_at[id(conn)] = time.monotonic()
+
+            if last_used is not None and time.monotonic() - last_used > Config.DB_POOL_PING_AFTER:
+                self._count("pings")
+                try:
+                    with conn.cursor() as cur:
+                        cur.execute("SELECT 1")
+                except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+                    self._count("ping_failures")
+                    logger.warning(f"⚠️  Bağlantı test başarısız, yenileniyor: {e}")
+                    last_error = e
+                    self._discard(conn)
+                    continue
+
+            return conn
+
+        raise last_error or psycopg2.OperationalError(f"{self.name} pool: canlı bağlantı bulunamadı")
+
+    def _discard(self, conn):
+        with self._lock:
+            self._last_used.pop(id(conn), None)
+            self._created_at.pop(id(conn), None)
+            self._stats["discarded"] += 1
+        try:
+            self._pool.putconn(conn, close=True)
+        except Exception:
+            pass
+
+    def owns(self, conn) -> bool:
+        with self._lock:
+            return id(conn) in self._checked_out
+
+    def putconn(self, conn):
+        with self._lock:
+            self._checked_out.discard(id(conn))
+            if conn.closed:
+                self._last_used.pop(id(conn), None)
+                self._created_at.pop(id(conn), None)
+            else:
+                self._last_used[id(conn)] = time.monotonic()
+
+        try:
+            if conn.closed:
+                logger.debug("⚠️  Kapalı bağlantı tespit edildi")
+                self._pool.putconn(conn, close=True)
+            else:
+                self._pool.putconn(conn)
+                logger.debug("✅ Bağlantı havuza geri kondu")
+
+                # Boştakiler maxconn'a ulaştıysa psycopg2 iade anında kapatır
+                if conn.closed:
+                    with self._lock:
+                        self._last_used.pop(id(conn), None)
+                        self._created_at.pop(id(conn), None)
+        except Exception as e:
+            logger.warning(f"⚠️  Havuza geri koyma başarısız, kapatılıyor: {e}")
+            try:
+                conn.close()
+            except:
+                pass
+        finally:
+            self._slots.release()
+
+    def closeall(self):
+        self._pool.closeall()
+
+    def status(self) -> dict:
+        now = time.monotonic()
+
+        with self._lock:
+            idle_conns = list(getattr(self._pool, "_pool", []))
+            idle_ids = {id(c) for c in idle_conns}
+
+            # Kapatılan/atılan bağlantılar düşer; yaş listesini sadece hâlâ açık (boşta veya kullanımda) olanlarla sınırla
+            live_ids = idle_ids | self._checked_out
+            for conn_id in list(self._created_at):
+                if conn_id not in live_ids:
+                    self._created_at.pop(conn_id, None)
+                    self._last_used.pop(conn_id, None)
+
+            ages = sorted(
+                (round(now - created, 1) for created in self._created_at.values()),
+                reverse=True
+            )
+            waits = sum(self._wait_histogram)
+
+            histogram = {
+                f"le_{upper}ms": count
+                for upper, count in zip(WAIT_BUCKETS_MS, self._wait_histogram)
+            }
+            histogram["gt_5000ms"] = self._wait_histogram[-1]
+
+            return {
+                "status": "active",
+                "name": self.name,
+                "min_connections": self.minconn,
+                "max_connections": self.maxconn,
+                "pool_type": "ThreadedConnectionPool",
+                "checked_out": len(self._checked_out),
+                "idle": len(idle_conns),
+                "waiting": self._waiting,
+                "counters": dict(self._stats),
+                "wait_ms": {
+                    "count": waits,
+                    "avg": round(self._wait_total_ms / waits, 2) if waits else 0,
+                    "max": round(self._wait_max_ms, 2),
+                    "histogram": histogram,
+                },
+                "connection_age_seconds": {
+                    "count": len(ages),
+                    "max": ages[0] if ages else 0,
+                    "min": ages[-1] if ages else 0,
+                    "ages": ages,
+                },
+            }
+
 
 def init_connection_pool():
     global _connection_pool
-    
+
     if _connection_pool is not None:
         logger.debug("✅ Connection pool zaten mevcut")
         return _connection_pool
-    
+
+    with _init_lock:
+        if _connection_pool is not None:
+            return _connection_pool
+
+        try:
+            _connection_pool = _ManagedPool(
+                "primary",
+                Config.DB_URL,
+                minconn=Config.DB_POOL_MIN,
+                maxconn=Config.DB_POOL_MAX
+            )
+
+            logger.info(
+                f"✅ PostgreSQL connection pool oluşturuldu "
+                f"(ThreadedConnectionPool, {Config.DB_POOL_MIN}-{Config.DB_POOL_MAX})"
+            )
+            return _connection_pool
+
+        except Exception as e:
+            logger.error(f"❌ Connection pool oluşturulamadı: {e}")
+            raise
+
+def init_read_pool():
+    """Config.DB_READ_URL tanımlıysa read replica pool'unu oluşturur, yoksa None."""
+    global _read_pool, _read_pool_failed_at
+
+    if not Config.DB_READ_URL:
+        return None
+
+    if _read_pool is not None:
+        return _read_pool
+
+    # Replica erişilemiyorsa her istekte yeniden bağlanmayı deneme
+    if time.monotonic() - _read_pool_failed_at < 30:
+        return None
+
+    with _init_lock:
+        if _read_pool is not None:
+            return _read_pool
+
+        try:
+            _read_pool = _ManagedPool(
+                "replica",
+                Config.DB_READ_URL,
+                minconn=Config.DB_READ_POOL_MIN,
+                maxconn=Config.DB_READ_POOL_MAX
+            )
+            logger.info(
+                f"✅ Read replica pool oluşturuldu "
+                f"({Config.DB_READ_POOL_MIN}-{Config.DB_READ_POOL_MAX})"
+            )
+            return _read_pool
+
+        except Exception as e:
+            _read_pool_failed_at = time.monotonic()
+            logger.error(f"❌ Read replica pool oluşturulamadı, primary kullanılacak: {e}")
+            return None
+
+def replica_lag_seconds():
+    """
+    Replica'nın primary'den ne kadar geride olduğunu (saniye) döndürür.
+    Config.DB_READ_LAG_CHECK_INTERVAL saniye cache'lenir; ölçülemezse None.
+    """
+    if _read_pool is None:
+        return None
+
+    with _lag_lock:
+        if time.monotonic() - _replica_lag["checked_at"] < Config.DB_READ_LAG_CHECK_INTERVAL:
+            return _replica_lag["value"]
+
+    lag = None
+    conn = None
     try:
-        _connection_pool = psycopg2.pool.ThreadedConnectionPool(
-            minconn=2,
-            maxconn=10,
-            dsn=Config.DB_URL,
-            connect_timeout=10,
-            options="-c statement_timeout=30000"
-        )
-        
-        logger.info("✅ PostgreSQL connection pool oluşturuldu (ThreadedConnectionPool)")
-        return _connection_pool
-        
+        conn = _read_pool.getconn()
+        with conn.cursor() as cur:
+            # Replay edilecek WAL kalmadıysa (boşta primary) gecikme 0 sayılır
+            cur.execute("""
+                SELECT CASE
+                    WHEN NOT pg_is_in_recovery() THEN 0
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(EXTRACT(EPOCH FROM (NOW() - pg_last_xact_replay_timestamp())), 0)
+                END;
+            """)
+            lag = float(cur.fetchone()[0])
     except Exception as e:
-        logger.error(f"❌ Connection pool oluşturulamadı: {e}")
+        logger.warning(f"⚠️  Replica gecikmesi ölçülemedi: {e}")
+    finally:
+        if conn is not None:
+            _read_pool.putconn(conn)
+
+    with _lag_lock:
+        _replica_lag["value"] = lag
+        _replica_lag["checked_at"] = time.monotonic()
+
+    return lag
+
+def _get_read_conn(max_staleness: float = None):
+    read_pool = init_read_pool()
+    if read_pool is None:
+        return None
+
+    if max_staleness is not None:
+        lag = replica_lag_seconds()
+        if lag is None or lag > max_staleness:
+            read_pool._count("primary_fallbacks")
+            logger.debug(f"⏭️  Replica gecikmesi {lag}s > {max_staleness}s, primary kullanılıyor")
+            return None
+
+    try:
+        return read_pool.getconn()
+    except PoolExhaustedError:
         raise
+    except Exception as e:
+        read_pool._count("primary_fallbacks")
+        logger.warning(f"⚠️  Replica bağlantısı alınamadı, primary kullanılıyor: {e}")
+        return None
+
+@contextmanager
+def read_staleness(max_staleness: float = None):
+    """
+    Blok içindeki read_only okumalar için max_staleness (saniye) şartı koyar;
+    daha sıkı olan değer geçerlidir. Negatif değer okumaları primary'ye yollar.
+    """
+    current = _read_staleness.get()
+    if max_staleness is not None and current is not None:
+        max_staleness = min(max_staleness, current)
+
+    token = _read_staleness.set(max_staleness if max_staleness is not None else current)
+    try:
+        yield
+    finally:
+        _read_staleness.reset(token)
+
+
+def current_read_staleness():
+    return _read_staleness.get()
+
+
+def replica_within(max_staleness: float = None) -> bool:
+    """Replica tanımlıysa ve en fazla max_staleness saniye gerideyse True."""
+    if init_read_pool() is None:
+        return False
+    if max_staleness is None:
+        return True
+
+    lag = replica_lag_seconds()
+    return lag is not None and lag <= max_staleness
+
+
+def get_db(read_only: bool = False, max_staleness: float = None):
+    """
+    read_only=True ise (DB_READ_URL tanımlıysa) read replica'dan bağlantı verir.
+    max_staleness (saniye) verilirse replica o kadar geride ise primary kullanılır;
+    verilmezse read_staleness() bloğundaki değer geçerlidir.
+    """
+    if read_only:
+        scoped = _read_staleness.get()
+        if scoped is not None:
+            max_staleness = scoped if max_staleness is None else min(max_staleness, scoped)
+
+        conn = _get_read_conn(max_staleness)
+        if conn is not None:
+            return conn
 
-def get_db():
-    global _connection_pool
-    
     if _connection_pool is None:
         init_connection_pool()
-    
+
     max_attempts = 3
     attempt = 0
-    
-    while attempt < max_attempts:
+
+    while True:
         try:
-            conn = _connection_pool.getconn()
-            
-            if conn.closed:
-                logger.warning("⚠️  Bağlantı kapalı, yeniden açılıyor...")
-                _connection_pool.putconn(conn, close=True)
-                conn = _connection_pool.getconn()
-            
-            try:
-                with conn.cursor() as cur:
-                    cur.execute("SELECT 1")
-                return conn
-            except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
-                logger.warning(f"⚠️  Bağlantı test başarısız, yenileniyor: {e}")
-                _connection_pool.putconn(conn, close=True)
-                attempt += 1
-                time.sleep(1)
-                continue
-            
-        except psycopg2.pool.PoolError as e:
-            logger.error(f"❌ Connection pool hatası: {e}")
-            try:
-                conn = psycopg2.connect(
-                    Config.DB_URL,
-                    connect_timeout=10,
-                    options="-c statement_timeout=30000"
-                )
-                logger.warning("⚠️  Pool dolu, direkt bağlantı açıldı")
-                return conn
-            except Exception as direct_error:
-                logger.error(f"❌ Direkt bağlantı da başarısız: {direct_error}")
-                attempt += 1
-                time.sleep(2)
-                continue
-        
+            return _connection_pool.getconn()
+
+        except PoolExhaustedError as e:
+            # Direkt bağlantı açmak yük altında bağlantı fırtınası yaratır
+            logger.error(f"❌ {e}")
+            raise
+
         except Exception as e:
             logger.error(f"❌ DB bağlantı hatası: {e}")
             attempt += 1
@@ -87,35 +466,18 @@ def get_db():
                 raise
 
 def put_db(conn):
-    global _connection_pool
-    
     if conn is None:
         return
-    
+
     try:
-        if conn.closed:
-            logger.debug("⚠️  Kapalı bağlantı tespit edildi")
-            if _connection_pool is not None:
-                try:
-                    _connection_pool.putconn(conn, close=True)
-                except:
-                    pass
-            return
-        
-        if _connection_pool is not None:
-            try:
-                _connection_pool.putconn(conn)
-                logger.debug("✅ Bağlantı havuza geri kondu")
-            except Exception as e:
-                logger.warning(f"⚠️  Havuza geri koyma başarısız, kapatılıyor: {e}")
-                try:
-                    conn.close()
-                except:
-                    pass
+        if _connection_pool is not None and _connection_pool.owns(conn):
+            _connection_pool.putconn(conn)
+        elif _read_pool is not None and _read_pool.owns(conn):
+            _read_pool.putconn(conn)
         else:
             conn.close()
             logger.debug("✅ Bağlantı kapatıldı")
-            
+
     except Exception as e:
         logger.error(f"❌ Bağlantı kapatma hatası: {e}")
         try:
@@ -124,9 +486,50 @@ def put_db(conn):
         except:
             pass
 
+@contextmanager
+def connection(read_only: bool = False, max_staleness: float = None):
+    """
+    Havuzdan bağlantı alır, blok bitince geri koyar.
+    Hata olursa rollback yapar. Pool doluysa PoolExhaustedError fırlatır.
+    """
+    conn = get_db(read_only=read_only, max_staleness=max_staleness)
+    try:
+        yield conn
+    except Exception:
+        try:
+            conn.rollback()
+        except:
+            pass
+        raise
+    finally:
+        put_db(conn)
+
+@contextmanager
+def cursor(commit: bool = False, read_only: bool = False, max_staleness: float = None):
+    """
+    connection() üzerinde cursor açar. commit=True ise blok başarıyla
+    bittiğinde commit eder. read_only=True okuma sorgularını replica'ya yönlendirir.
+    """
+    with connection(read_only=read_only, max_staleness=max_staleness) as conn:
+        cur = conn.cursor()
+        try:
+            yield cur
+            if commit:
+                conn.commit()
+        finally:
+            cur.close()
+
 def close_all_connections():
-    global _connection_pool
-    
+    global _connection_pool, _read_pool
+
+    if _read_pool is not None:
+        try:
+            _read_pool.closeall()
+        except Exception as e:
+            logger.error(f"❌ Replica bağlantılarını kapatma hatası: {e}")
+        finally:
+            _read_pool = None
+
     if _connection_pool is not None:
         try:
             _connection_pool.closeall()
@@ -138,37 +541,35 @@ def close_all_connections():
 
 def test_connection():
     try:
-        conn = get_db()
-        cur = conn.cursor()
-        cur.execute("SELECT 1;")
-        result = cur.fetchone()
-        cur.close()
-        put_db(conn)
-        
+        with cursor() as cur:
+            cur.execute("SELECT 1;")
+            result = cur.fetchone()
+
         if result:
             logger.info("✅ Veritabanı bağlantısı başarılı")
             return True
         else:
             logger.error("❌ Veritabanı sorgu hatası")
             return False
-            
+
     except Exception as e:
         logger.error(f"❌ Veritabanı test hatası: {e}")
         return False
 
 def get_pool_status():
-    global _connection_pool
-    
     if _connection_pool is None:
         return {"status": "not_initialized"}
-    
+
     try:
-        return {
-            "status": "active",
-            "min_connections": 2,
-            "max_connections": 10,
-            "pool_type": "ThreadedConnectionPool"
-        }
+        status = _connection_pool.status()
+
+        if _read_pool is not None:
+            status["read_replica"] = _read_pool.status()
+            status["read_replica"]["lag_seconds"] = _replica_lag["value"]
+        elif Config.DB_READ_URL:
+            status["read_replica"] = {"status": "unavailable"}
+
+        return status
     except Exception as e:
         logger.error(f"❌ Pool status hatası: {e}")
         return {"status": "error", "error": str(e)}
@@ -0,0 +1,606 @@
+"""
+Sıralı, versiyonlu şema migration'ları.
+
+Her migration schema_version tablosuna bir satır yazar ve kendi transaction'ında
+çalışır. Aynı anda açılan gunicorn worker'ları pg_advisory_lock ile sıraya girer;
+şema güncelse boot sırasında tek bir versiyon sorgusu çalışır.
+
+Yeni şema değişikliği = MIGRATIONS listesinin sonuna yeni bir kayıt.
+Eski kurulumlar (schema_version tablosu olmayan) tüm adımları baştan çalıştırır;
+bu yüzden adımlar IF NOT EXISTS / IF EXISTS ile idempotent yazılır.
+"""
+from models.db import get_db, put_db
+from config import Config
+from psycopg2 import errors as pg_errors
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tüm worker'ların paylaştığı sabit advisory lock anahtarı
+MIGRATION_LOCK_KEY = 7_240_113
+
+# v1 itibarıyla news kolonları (id ve PRIMARY KEY hariç). Sonradan eklenen
+# kolonlar buraya değil, kendi migration adımlarına yazılır.
+BASE_NEWS_COLUMNS = """
+                category VARCHAR(50) NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                full_content TEXT,
+                url TEXT NOT NULL,
+                image TEXT,
+                source VARCHAR(100),
+                published TIMESTAMPTZ,
+                saved_at TIMESTAMPTZ DEFAULT (NOW() AT TIME ZONE 'UTC'),
+                expires_at TIMESTAMPTZ NOT NULL,
+                title_url_hash VARCHAR(64),
+                is_scraped BOOLEAN NOT NULL DEFAULT FALSE,
+                url_hash VARCHAR(32)"""
+
+
+# ----------------------------------------------------------
+# MIGRATION ADIMLARI
+# ----------------------------------------------------------
+
+def _m001_base_tables(cur):
+    from models.news_models import NewsModel
+
+    cur.execute("SELECT to_regclass('public.news') IS NOT NULL;")
+    news_exists = cur.fetchone()[0]
+
+    if not news_exists and Config.NEWS_PARTITIONED:
+        # expires_at'e göre günlük partition'lar; PK partition anahtarını içermek zorunda
+        cur.execute(f"""
+            CREATE TABLE news (
+                id SERIAL,{BASE_NEWS_COLUMNS},
+                PRIMARY KEY (id, expires_at)
+            ) PARTITION BY RANGE (expires_at);
+
+            CREATE TABLE news_default PARTITION OF news DEFAULT;
+        """)
+        logger.info("🧩 news tablosu partitioned (expires_at, günlük) olarak oluşturuldu")
+    else:
+        cur.execute(f"""
+            CREATE TABLE IF NOT EXISTS news (
+                id SERIAL PRIMARY KEY,{BASE_NEWS_COLUMNS}
+            );
+        """)
+
+    partitioned = NewsModel._detect_partitioned(cur)
+    if Config.NEWS_PARTITIONED and not partitioned:
+        logger.warning(
+            "⚠️  NEWS_PARTITIONED açık ama mevcut news tablosu partitioned değil; "
+            "düz tablo kullanılmaya devam ediliyor"
+        )
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS scraping_blacklist (
+            id SERIAL PRIMARY KEY,
+            url_hash VARCHAR(64) NOT NULL UNIQUE,
+            url TEXT NOT NULL,
+            fail_count INTEGER DEFAULT 1,
+            last_attempt TIMESTAMPTZ DEFAULT (NOW() AT TIME ZONE 'UTC'),
+            reason TEXT
+        );
+    """)
+
+    cur.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name='news' AND column_name='full_content'
+            ) THEN
+                ALTER TABLE news ADD COLUMN full_content TEXT;
+                RAISE NOTICE '✅ full_content kolonu eklendi';
+            END IF;
+
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name='news' AND column_name='title_url_hash'
+            ) THEN
+                ALTER TABLE news ADD COLUMN title_url_hash VARCHAR(64);
+                RAISE NOTICE '✅ title_url_hash kolonu eklendi';
+            END IF;
+
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name='news' AND column_name='expires_at'
+            ) THEN
+                ALTER TABLE news ADD COLUMN expires_at TIMESTAMPTZ NOT NULL DEFAULT ((NOW() AT TIME ZONE 'UTC') + INTERVAL '7 days');
+                RAISE NOTICE '✅ expires_at kolonu eklendi';
+            END IF;
+
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name='news'
+                AND column_name='saved_at'
+                AND data_type='timestamp without time zone'
+            ) THEN
+                ALTER TABLE news ALTER COLUMN saved_at TYPE TIMESTAMPTZ USING saved_at AT TIME ZONE 'UTC';
+                RAISE NOTICE '🔧 saved_at TIMESTAMPTZ olarak güncellendi';
+            END IF;
+
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name='news'
+                AND column_name='published'
+                AND data_type='timestamp without time zone'
+            ) THEN
+                ALTER TABLE news ALTER COLUMN published TYPE TIMESTAMPTZ USING published AT TIME ZONE 'UTC';
+                RAISE NOTICE '🔧 published TIMESTAMPTZ olarak güncellendi';
+            END IF;
+
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name='news'
+                AND column_name='expires_at'
+                AND data_type='timestamp without time zone'
+            ) THEN
+                ALTER TABLE news ALTER COLUMN expires_at TYPE TIMESTAMPTZ USING expires_at AT TIME ZONE 'UTC';
+                RAISE NOTICE '🔧 expires_at TIMESTAMPTZ olarak güncellendi';
+            END IF;
+        END $$;
+    """)
+
+    cur.execute("""
+        UPDATE news
+        SET title_url_hash = MD5(LOWER(TRIM(title)) || url)
+        WHERE title_url_hash IS NULL;
+    """)
+
+    if partitioned:
+        # Partitioned tabloda partition anahtarı olmadan UNIQUE index kurulamaz;
+        # duplicate kontrolü _insert_rows içinde NOT EXISTS ile yapılır
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_news_title_url_hash
+            ON news(title_url_hash);
+        """)
+        NewsModel._create_partitions(cur)
+    else:
+        cur.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_news_unique_hash
+            ON news(title_url_hash);
+        """)
+
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_news_expires_at
+        ON news(expires_at);
+
+        CREATE INDEX IF NOT EXISTS idx_news_published
+        ON news(published DESC);
+
+        CREATE INDEX IF NOT EXISTS idx_blacklist_hash
+        ON scraping_blacklist(url_hash);
+    """)
+
+
+def _m002_keyset_indexes(cur):
+    cur.execute("""
+        DROP INDEX IF EXISTS idx_news_category;
+        DROP INDEX IF EXISTS idx_news_saved_at;
+
+        CREATE INDEX IF NOT EXISTS idx_news_saved_at_id
+        ON news(saved_at DESC, id DESC);
+
+        CREATE INDEX IF NOT EXISTS idx_news_category_saved_at_id
+        ON news(category, saved_at DESC, id DESC);
+    """)
+
+
+def _m003_is_scraped(cur):
+    cur.execute("""
+        DO $$
+        BEGIN
+            IF NOT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name='news' AND column_name='is_scraped'
+            ) THEN
+                ALTER TABLE news ADD COLUMN is_scraped BOOLEAN NOT NULL DEFAULT FALSE;
+                UPDATE news
+                SET is_scraped = (full_content IS NOT NULL AND LENGTH(full_content) > 100);
+                RAISE NOTICE '✅ is_scraped kolonu eklendi';
+            END IF;
+
+            -- Eski şemada is_scraped DEFAULT TRUE idi ve hiç yazılmıyordu:
+            -- default'u düzelt ve mevcut satırları bir kereye mahsus doldur
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name='news'
+                AND column_name='is_scraped'
+                AND column_default='true'
+            ) THEN
+                ALTER TABLE news ALTER COLUMN is_scraped SET DEFAULT FALSE;
+                UPDATE news
+                SET is_scraped = (full_content IS NOT NULL AND LENGTH(full_content) > 100);
+                RAISE NOTICE '🔧 is_scraped backfill tamamlandı';
+            END IF;
+        END $$;
+    """)
+
+    cur.execute("""
+        CREATE INDEX IF NOT EXISTS idx_news_scraped_saved_at_id
+        ON news(saved_at DESC, id DESC) WHERE is_scraped;
+
+        CREATE INDEX IF NOT EXISTS idx_news_scraped_category_saved_at_id
+        ON news(category, saved_at DESC, id DESC) WHERE is_scraped;
+
+        CREATE INDEX IF NOT EXISTS idx_news_unscraped_saved_at
+        ON news(saved_at DESC) WHERE NOT is_scraped;
+    """)
+
+
+def _m004_url_hash(cur):
+    cur.execute("""
+        ALTER TABLE news ADD COLUMN IF NOT EXISTS url_hash VARCHAR(32);
+
+        UPDATE news
+        SET url_hash = MD5(url)
+        WHERE url_hash IS NULL;
+
+        CREATE INDEX IF NOT EXISTS idx_news_url_hash
+        ON news(url_hash);
+    """)
+
+
+def _m005_api_usage(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS api_usage (
+            id SERIAL PRIMARY KEY,
+            api_name TEXT NOT NULL,
+            request_count INTEGER DEFAULT 0,
+            success_count INTEGER DEFAULT 0,
+            fail_count INTEGER DEFAULT 0,
+            date DATE DEFAULT CURRENT_DATE,
+            created_at TIMESTAMP DEFAULT (NOW() AT TIME ZONE 'UTC'),
+            updated_at TIMESTAMP DEFAULT (NOW() AT TIME ZONE 'UTC'),
+            UNIQUE(api_name, date)
+        );
+
+        CREATE INDEX IF NOT EXISTS idx_api_usage_date
+        ON api_usage(date DESC);
+
+        CREATE INDEX IF NOT EXISTS idx_api_usage_api_name
+        ON api_usage(api_name);
+    """)
+
+
+def _m006_system_info(cur):
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS system_info (
+            id INTEGER PRIMARY KEY,
+            last_update TIMESTAMP
+        );
+
+        INSERT INTO system_info (id, last_update)
+        VALUES (1, NULL)
+        ON CONFLICT (id) DO NOTHING;
+    """)
+
+
+def _m007_excerpt(cur):
+    # NewsModel.make_excerpt() ile aynı kural: boşluklar tekilleştirilir,
+    # uzun metin son kelime sınırından kesilip "…" eklenir
+    cur.execute("""
+        ALTER TABLE news ADD COLUMN IF NOT EXISTS excerpt TEXT;
+
+        UPDATE news
+        SET excerpt = CASE
+            WHEN LENGTH(t.body) <= %(n)s THEN t.body
+            ELSE REGEXP_REPLACE(LEFT(t.body, %(n)s + 1), '\\s+\\S*$', '') || '…'
+        END
+        FROM (
+            SELECT id, BTRIM(REGEXP_REPLACE(full_content, '\\s+', ' ', 'g')) AS body
+            FROM news
+            WHERE full_content IS NOT NULL AND excerpt IS NULL
+        ) AS t
+        WHERE news.id = t.id;
+    """, {"n": Config.EXCERPT_LENGTH})
+
+
+def _m008_compressed_content(cur):
+    # Config.CONTENT_COMPRESSION açıkken gövde full_content_z'de tutulur
+    # (bkz. utils/compression.py), full_content NULL olur
+    cur.execute("""
+        ALTER TABLE news ADD COLUMN IF NOT EXISTS full_content_z BYTEA;
+
+        CREATE TABLE IF NOT EXISTS content_dictionaries (
+            id SERIAL PRIMARY KEY,
+            codec TEXT NOT NULL,
+            dictionary BYTEA NOT NULL,
+            sample_count INTEGER NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+    """)
+
+
+def _m009_news_counters(cur):
+    # Statement-level trigger'lar: her INSERT/UPDATE/DELETE ifadesi transition
+    # table üzerinden (category, is_scraped) başına tek bir delta uygular.
+    # Partition DROP trigger tetiklemez → NewsModel.reconcile_counters()
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS news_counters (
+            category VARCHAR(50) NOT NULL,
+            is_scraped BOOLEAN NOT NULL,
+            n BIGINT NOT NULL DEFAULT 0,
+            PRIMARY KEY (category, is_scraped)
+        );
+
+        CREATE OR REPLACE FUNCTION news_counters_on_insert() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO news_counters (category, is_scraped, n)
+            SELECT category, is_scraped, COUNT(*)
+            FROM new_rows
+            GROUP BY category, is_scraped
+            ORDER BY category, is_scraped
+            ON CONFLICT (category, is_scraped)
+            DO UPDATE SET n = news_counters.n + EXCLUDED.n;
+            RETURN NULL;
+        END $$;
+
+        CREATE OR REPLACE FUNCTION news_counters_on_update() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            -- Sadece category / is_scraped değişen satırlar net delta üretir
+            INSERT INTO news_counters (category, is_scraped, n)
+            SELECT category, is_scraped, SUM(delta)
+            FROM (
+                SELECT category, is_scraped, -1 AS delta FROM old_rows
+                UNION ALL
+                SELECT category, is_scraped, 1 AS delta FROM new_rows
+            ) AS d
+            GROUP BY category, is_scraped
+            HAVING SUM(delta) <> 0
+            ORDER BY category, is_scraped
+            ON CONFLICT (category, is_scraped)
+            DO UPDATE SET n = news_counters.n + EXCLUDED.n;
+            RETURN NULL;
+        END $$;
+
+        CREATE OR REPLACE FUNCTION news_counters_on_delete() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO news_counters (category, is_scraped, n)
+            SELECT category, is_scraped, -COUNT(*)
+            FROM old_rows
+            GROUP BY category, is_scraped
+            ORDER BY category, is_scraped
+            ON CONFLICT (category, is_scraped)
+            DO UPDATE SET n = news_counters.n + EXCLUDED.n;
+            RETURN NULL;
+        END $$;
+
+        DROP TRIGGER IF EXISTS news_counters_ins ON news;
+        CREATE TRIGGER news_counters_ins
+        AFTER INSERT ON news
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION news_counters_on_insert();
+
+        DROP TRIGGER IF EXISTS news_counters_upd ON news;
+        CREATE TRIGGER news_counters_upd
+        AFTER UPDATE ON news
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION news_counters_on_update();
+
+        DROP TRIGGER IF EXISTS news_counters_del ON news;
+        CREATE TRIGGER news_counters_del
+        AFTER DELETE ON news
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION news_counters_on_delete();
+
+        -- İlk doldurma: migration bitene kadar news'e yazma engellenir
+        LOCK TABLE news IN SHARE MODE;
+        DELETE FROM news_counters;
+        INSERT INTO news_counters (category, is_scraped, n)
+        SELECT category, is_scraped, COUNT(*)
+        FROM news
+        GROUP BY category, is_scraped;
+    """)
+
+
+def _m010_search_vector(cur):
+    # Sıkıştırılmış kayıtlarda full_content NULL olduğu için gövde yerine excerpt girer
+    cur.execute("""
+        ALTER TABLE news ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('turkish', COALESCE(title, '')), 'A') ||
+            setweight(to_tsvector('turkish', COALESCE(description, '')), 'B') ||
+            setweight(to_tsvector('turkish', COALESCE(full_content, excerpt, '')), 'C')
+        ) STORED;
+
+        CREATE INDEX IF NOT EXISTS idx_news_search_vector
+        ON news USING GIN (search_vector);
+    """)
+
+
+def _m011_title_trigram(cur):
+    # title_norm ifadesi NewsModel.find_near_duplicates() ile aynı olmalı
+    cur.execute("""
+        CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+        ALTER TABLE news ADD COLUMN IF NOT EXISTS title_norm TEXT
+        GENERATED ALWAYS AS (
+            LOWER(REGEXP_REPLACE(BTRIM(title), '\\s+', ' ', 'g'))
+        ) STORED;
+
+        CREATE INDEX IF NOT EXISTS idx_news_title_norm_trgm
+        ON news USING GIN (title_norm gin_trgm_ops);
+    """)
+
+
+def _m012_canonical_url(cur):
+    from models.news_models import NewsModel
+    from psycopg2.extras import execute_values
+
+    cur.execute("ALTER TABLE news ADD COLUMN IF NOT EXISTS canonical_url TEXT;")
+
+    # canonicalize_url Python'da olduğu için backfill id sırasıyla partiler halinde
+    last_id = 0
+    while True:
+        cur.execute("""
+            SELECT id, url FROM news
+            WHERE id > %s AND canonical_url IS NULL
+            ORDER BY id
+            LIMIT 2000;
+        """, (last_id,))
+        rows = cur.fetchall()
+        if not rows:
+            break
+
+        execute_values(cur, """
+            UPDATE news SET canonical_url = v.canonical_url
+            FROM (VALUES %s) AS v (id, canonical_url)
+            WHERE news.id = v.id;
+        """, [(i, NewsModel._canonical_url(u)) for i, u in rows],
+            template="(%s::integer, %s::text)", page_size=len(rows))
+        last_id = rows[-1][0]
+
+    # Aynı canonical_url'e sahip eski kopyalarda (scrape edilmiş ve en eski olan
+    # hariç) kolon NULL'lanır; satırlar süreleri dolunca normal temizlikle gider
+    cur.execute("""
+        UPDATE news SET canonical_url = NULL
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY canonical_url ORDER BY is_scraped DESC, id
+                ) AS rn
+                FROM news
+                WHERE canonical_url IS NOT NULL
+            ) AS ranked
+            WHERE rn > 1
+        );
+    """)
+
+    if NewsModel._detect_partitioned(cur):
+        # Partition anahtarını içermeyen UNIQUE index kurulamaz → NOT EXISTS
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_news_canonical_url
+            ON news(canonical_url);
+        """)
+    else:
+        cur.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_news_canonical_url
+            ON news(canonical_url);
+        """)
+
+
+def _m013_news_generations(cur):
+    # Kategori başına DB tarafı değişiklik sırası: NewsModel._notify_changes
+    # NOTIFY ile aynı transaction'da günceller. Tüm worker'lar aynı değerleri
+    # gördüğü için ETag'ler worker'dan ve yeniden başlatmadan bağımsızdır.
+    # category = '*': tüm kategorileri etkileyen değişiklikler (partition drop)
+    cur.execute("""
+        CREATE SEQUENCE IF NOT EXISTS news_change_seq;
+
+        CREATE TABLE IF NOT EXISTS news_generations (
+            category VARCHAR(50) PRIMARY KEY,
+            seq BIGINT NOT NULL,
+            changed_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+    """)
+
+
+MIGRATIONS = [
+    (1, "news + scraping_blacklist tabloları", _m001_base_tables),
+    (2, "keyset pagination index'leri", _m002_keyset_indexes),
+    (3, "is_scraped bayrağı + partial index'ler", _m003_is_scraped),
+    (4, "news.url_hash kolonu", _m004_url_hash),
+    (5, "api_usage tablosu", _m005_api_usage),
+    (6, "system_info tablosu", _m006_system_info),
+    (7, "news.excerpt kolonu + backfill", _m007_excerpt),
+    (8, "sıkıştırılmış içerik kolonu + sözlük tablosu", _m008_compressed_content),
+    (9, "news_counters tablosu + trigger'lar", _m009_news_counters),
+    (10, "search_vector (turkish) + GIN index", _m010_search_vector),
+    (11, "pg_trgm + title_norm trigram index", _m011_title_trigram),
+    (12, "canonical_url kolonu + unique index", _m012_canonical_url),
+    (13, "news_generations + news_change_seq", _m013_news_generations),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+# ----------------------------------------------------------
+# ÇALIŞTIRICI
+# ----------------------------------------------------------
+
+def get_schema_version(cur) -> int:
+    """schema_version tablosu yoksa 0 döner (cursor'ın transaction'ı geri alınır)."""
+    try:
+        cur.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version;")
+        return cur.fetchone()[0]
+    except pg_errors.UndefinedTable:
+        cur.connection.rollback()
+        return 0
+
+
+def apply_migrations() -> int:
+    """
+    Bekleyen migration'ları advisory lock altında sırayla uygular.
+    Şema güncelse tek bir SELECT ile döner. Son şema versiyonunu döndürür.
+    """
+    conn = None
+    session_changed = False
+    try:
+        conn = get_db()
+        cur = conn.cursor()
+
+        version = get_schema_version(cur)
+        conn.commit()
+
+        if version >= LATEST_VERSION:
+            logger.debug(f"✅ Şema güncel (v{version})")
+            return version
+
+        # Diğer worker'lar migration yaparken burada bekler
+        session_changed = True
+        cur.execute("SET statement_timeout = 0;")
+        cur.execute("SELECT pg_advisory_lock(%s);", (MIGRATION_LOCK_KEY,))
+
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_version (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            );
+        """)
+        conn.commit()
+
+        # Lock beklerken başka bir worker uygulamış olabilir
+        version = get_schema_version(cur)
+
+        for number, description, migrate in MIGRATIONS:
+            if number <= version:
+                continue
+
+            logger.info(f"🔧 Migration v{number}: {description}")
+            migrate(cur)
+            cur.execute(
+                "INSERT INTO schema_version (version, description) VALUES (%s, %s);",
+                (number, description)
+            )
+            conn.commit()
+            version = number
+
+        logger.info(f"✅ Şema v{version} seviyesinde")
+        return version
+
+    except Exception as e:
+        logger.error(f"❌ Migration hatası: {e}")
+        if conn:
+            conn.rollback()
+        raise
+    finally:
+        if conn:
+            try:
+                if session_changed:
+                    # Bağlantı havuza dönmeden session durumu temizlenir
+                    cur.execute("SELECT pg_advisory_unlock_all();")
+                    cur.execute("RESET statement_timeout;")
+                    conn.commit()
+            except Exception:
+                pass
+            try:
+                cur.close()
+            except Exception:
+                pass
+            put_db(conn)
@@ -1,272 +1,542 @@
 from datetime import datetime, timedelta
 from config import Config
-from models.db import get_db, put_db
+from models.db import get_db, put_db, cursor as db_cursor, PoolExhaustedError
+from utils import compression
+from utils.helpers import canonicalize_url
+from utils.raw_json import RawJSON
+from psycopg2.extras import execute_values
 import logging
 import pytz
 import hashlib
+import base64
+import threading
+import time
+import re
+import json
+import html
+from collections import OrderedDict
 
 logger = logging.getLogger(__name__)
 
 
 class NewsModel:
 
+    # full_content_z sadece full_content NULL ise (sıkıştırılmış kayıt) açılır
+    LIST_COLUMNS = """id, category, title, description, full_content,
+                   url, image, source, published, saved_at, full_content_z"""
+
+    # view=list: full_content (TOAST) okunmaz, yerine kısa excerpt döner
+    LIST_COLUMNS_LIGHT = """id, category, title, description, excerpt,
+                         url, image, source, published, saved_at"""
+
+    LIST_VIEWS = ("full", "list")
+
+    # _prepare_row() tuple sırası ile aynı
+    INSERT_COLUMNS = """category, title, description, url,
+                     image, source, published, expires_at, title_url_hash, saved_at,
+                     is_scraped, url_hash, canonical_url"""
+
+    # Config.NEWS_PARTITIONED'den bağımsız olarak DB'deki gerçek durum
+    _partitioned = None
+
+    # is_scraped = full_content IS NOT NULL AND LENGTH(full_content) > 100
+    SCRAPED_MIN_LENGTH = 100
+
+    BLACKLIST_THRESHOLD = 3
+
+    # ts_headline işaretleri: metin HTML-escape edildikten sonra <b>/</b> olur
+    HIGHLIGHT_START = "\ue000"
+    HIGHLIGHT_STOP = "\ue001"
+
+    # Yazma yolları bu kanala NOTIFY gönderir (bkz. services/change_feed.py)
+    CHANGE_CHANNEL = "news_changed"
+    # news_generations'ta tüm kategorileri etkileyen değişikliklerin anahtarı
+    ALL_CATEGORIES_KEY = "*"
+    # Blacklist sayısı (scraped/stats) değiştiğinde artan anahtar
+    BLACKLIST_KEY = "blacklist"
+
+    # Partitioned modda INSERT'leri sıraya sokan advisory lock anahtarı
+    # (migrations.MIGRATION_LOCK_KEY'den farklı olmalı)
+    INSERT_LOCK_KEY = 7_240_114
+
+    # load_blacklist() ile doldurulan process-local url_hash seti
+    _blacklist_cache = None
+
+    # get_stats() için process-local TTL cache
+    _stats_cache = None
+    _stats_cache_at = 0.0
+    _stats_lock = threading.Lock()
+
+    # get_by_id() için process-local TTL + LRU cache: id → (zaman, dict)
+    _detail_cache = OrderedDict()
+    _detail_lock = threading.Lock()
+
+    # Sıkıştırma sözlükleri: id → bytes; aktif sözlük codec başına 5 dk cache'lenir
+    _dictionaries = {}
+    _active_dictionary = {}
+    _dictionary_lock = threading.Lock()
+
     @staticmethod
     def create_table():
+        """
+        Şemayı models/migrations.py'deki sıralı migration'larla günceller.
+        Şema güncelse tek bir versiyon sorgusu çalışır.
+        """
+        from models.migrations import apply_migrations
+
+        try:
+            version = apply_migrations()
+            logger.info(f"✅ news tablosu hazır (şema v{version})")
+            return version
+        except Exception as e:
+            logger.error(f"❌ Tablo oluşturma hatası: {e}")
+            raise
+
+    @staticmethod
+    def _detect_partitioned(cur) -> bool:
+        cur.execute("""
+            SELECT EXISTS (
+                SELECT 1 FROM pg_partitioned_table p
+                JOIN pg_class c ON c.oid = p.partrelid
+                WHERE c.relname = 'news'
+            );
+        """)
+        NewsModel._partitioned = bool(cur.fetchone()[0])
+        return NewsModel._partitioned
+
+    @staticmethod
+    def is_partitioned() -> bool:
+        if NewsModel._partitioned is None:
+            with db_cursor() as cur:
+                NewsModel._detect_partitioned(cur)
+        return NewsModel._partitioned
+
+    @staticmethod
+    def _partition_name(day) -> str:
+        return f"news_p{day.strftime('%Y%m%d')}"
+
+    @staticmethod
+    def _create_partitions(cur, days_ahead: int = None) -> int:
+        """
+        Dünden itibaren days_ahead gün ilerisine kadar eksik günlük partition'ları
+        verilen cursor'ın transaction'ında oluşturur (her biri kendi savepoint'inde).
+        """
+        if days_ahead is None:
+            days_ahead = Config.NEWS_EXPIRATION_DAYS + 2
+
+        today = datetime.now(pytz.UTC).date()
+        created = 0
+
+        for offset in range(-1, days_ahead + 1):
+            day = today + timedelta(days=offset)
+            name = NewsModel._partition_name(day)
+
+            cur.execute("SELECT to_regclass(%s) IS NOT NULL;", (f"public.{name}",))
+            if cur.fetchone()[0]:
+                continue
+
+            cur.execute("SAVEPOINT create_partition;")
+            try:
+                cur.execute(f"""
+                    CREATE TABLE {name} PARTITION OF news
+                    FOR VALUES FROM ('{day.isoformat()} 00:00:00+00')
+                                 TO ('{(day + timedelta(days=1)).isoformat()} 00:00:00+00');
+                """)
+                cur.execute("RELEASE SAVEPOINT create_partition;")
+                created += 1
+            except Exception as e:
+                # Default partition'da bu aralığa düşen satır varsa oluşturulamaz
+                cur.execute("ROLLBACK TO SAVEPOINT create_partition;")
+                logger.warning(f"⚠️  {name} partition oluşturulamadı: {e}")
+
+        if created:
+            logger.info(f"🧩 {created} yeni news partition'ı oluşturuldu")
+        return created
+
+    @staticmethod
+    def ensure_partitions(days_ahead: int = None) -> int:
+        """Eksik günlük partition'ları oluşturur, yeni partition sayısını döndürür."""
         conn = None
         try:
             conn = get_db()
             cur = conn.cursor()
 
-            cur.execute("""
-                CREATE TABLE IF NOT EXISTS news (
-                    id SERIAL PRIMARY KEY,
-                    category VARCHAR(50) NOT NULL,
-                    title TEXT NOT NULL,
-                    description TEXT,
-                    full_content TEXT,
-                    url TEXT NOT NULL,
-                    image TEXT,
-                    source VARCHAR(100),
-                    published TIMESTAMPTZ,
-                    saved_at TIMESTAMPTZ DEFAULT (NOW() AT TIME ZONE 'UTC'),
-                    expires_at TIMESTAMPTZ NOT NULL,
-                    title_url_hash VARCHAR(64),
-                    is_scraped BOOLEAN NOT NULL DEFAULT TRUE
-                );
-                
-                CREATE TABLE IF NOT EXISTS scraping_blacklist (
-                    id SERIAL PRIMARY KEY,
-                    url_hash VARCHAR(64) NOT NULL UNIQUE,
-                    url TEXT NOT NULL,
-                    fail_count INTEGER DEFAULT 1,
-                    last_attempt TIMESTAMPTZ DEFAULT (NOW() AT TIME ZONE 'UTC'),
-                    reason TEXT
-                );
-            """)
+            created = NewsModel._create_partitions(cur, days_ahead)
+            conn.commit()
+            return created
 
-            cur.execute("""
-                DO $$ 
-                BEGIN
-                    IF NOT EXISTS (
-                        SELECT 1 FROM information_schema.columns 
-                        WHERE table_name='news' AND column_name='full_content'
-                    ) THEN
-                        ALTER TABLE news ADD COLUMN full_content TEXT;
-                        RAISE NOTICE '✅ full_content kolonu eklendi';
-                    END IF;
-                    
-                    IF NOT EXISTS (
-                        SELECT 1 FROM information_schema.columns 
-                        WHERE table_name='news' AND column_name='title_url_hash'
-                    ) THEN
-                        ALTER TABLE news ADD COLUMN title_url_hash VARCHAR(64);
-                        RAISE NOTICE '✅ title_url_hash kolonu eklendi';
-                    END IF;
-                    
-                    IF NOT EXISTS (
-                        SELECT 1 FROM information_schema.columns 
-                        WHERE table_name='news' AND column_name='expires_at'
-                    ) THEN
-                        ALTER TABLE news ADD COLUMN expires_at TIMESTAMPTZ NOT NULL DEFAULT ((NOW() AT TIME ZONE 'UTC') + INTERVAL '7 days');
-                        RAISE NOTICE '✅ expires_at kolonu eklendi';
-                    END IF;
-
-                    IF NOT EXISTS (
-                        SELECT 1 FROM information_schema.columns 
-                        WHERE table_name='news' AND column_name='is_scraped'
-                    ) THEN
-                        ALTER TABLE news ADD COLUMN is_scraped BOOLEAN NOT NULL DEFAULT TRUE;
-                        RAISE NOTICE '✅ is_scraped kolonu eklendi';
-                    END IF;
-                    
-                    IF EXISTS (
-                        SELECT 1 FROM information_schema.columns 
-                        WHERE table_name='news' 
-                        AND column_name='saved_at' 
-                        AND data_type='timestamp without time zone'
-                    ) THEN
-                        ALTER TABLE news ALTER COLUMN saved_at TYPE TIMESTAMPTZ USING saved_at AT TIME ZONE 'UTC';
-                        RAISE NOTICE '🔧 saved_at TIMESTAMPTZ olarak güncellendi';
-                    END IF;
-                    
-                    IF EXISTS (
-                        SELECT 1 FROM information_schema.columns 
-                        WHERE table_name='news' 
-                        AND column_name='published' 
-                        AND data_type='timestamp without time zone'
-                    ) THEN
-                        ALTER TABLE news ALTER COLUMN published TYPE TIMESTAMPTZ USING published AT TIME ZONE 'UTC';
-                        RAISE NOTICE '🔧 published TIMESTAMPTZ olarak güncellendi';
-                    END IF;
-                    
-                    IF EXISTS (
-                        SELECT 1 FROM information_schema.columns 
-                        WHERE table_name='news' 
-                        AND column_name='expires_at' 
-                        AND data_type='timestamp without time zone'
-                    ) THEN
-                        ALTER TABLE news ALTER COLUMN expires_at TYPE TIMESTAMPTZ USING expires_at AT TIME ZONE 'UTC';
-                        RAISE NOTICE '🔧 expires_at TIMESTAMPTZ olarak güncellendi';
-                    END IF;
-                END $$;
-            """)
+        except Exception as e:
+            logger.error(f"❌ ensure_partitions hatası: {e}")
+            if conn:
+                conn.rollback()
+            return 0
+        finally:
+            if conn:
+                cur.close() if 'cur' in locals() else None
+                put_db(conn)
 
-            cur.execute("""
-                UPDATE news 
-                SET title_url_hash = MD5(LOWER(TRIM(title)) || url)
-                WHERE title_url_hash IS NULL;
-            """)
+    @staticmethod
+    def drop_expired_partitions() -> dict:
+        """
+        Tüm satırlarının süresi dolmuş günlük partition'ları (gün < bugün, UTC)
+        DETACH + DROP eder. Satır sayısı pg_class.reltuples tahminidir.
+        """
+        result = {"dropped_partitions": 0, "estimated_rows": 0}
+        today = datetime.now(pytz.UTC).date()
+
+        conn = None
+        try:
+            conn = get_db()
+            cur = conn.cursor()
 
             cur.execute("""
-                CREATE UNIQUE INDEX IF NOT EXISTS idx_news_unique_hash 
-                ON news(title_url_hash);
-                
-                CREATE INDEX IF NOT EXISTS idx_news_category 
-                ON news(category);
-                
-                CREATE INDEX IF NOT EXISTS idx_news_saved_at 
-                ON news(saved_at DESC);
-                
-                CREATE INDEX IF NOT EXISTS idx_news_expires_at 
-                ON news(expires_at);
-                
-                CREATE INDEX IF NOT EXISTS idx_news_published 
-                ON news(published DESC);
-                
-                CREATE INDEX IF NOT EXISTS idx_blacklist_hash 
-                ON scraping_blacklist(url_hash);
+                SELECT c.relname, GREATEST(c.reltuples, 0)::BIGINT
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                JOIN pg_class p ON p.oid = i.inhparent
+                WHERE p.relname = 'news'
+                ORDER BY c.relname;
             """)
 
-            conn.commit()
-            logger.info("✅ news tablosu hazır (otomatik migration + timezone + is_scraped fix tamamlandı)")
+            for name, estimated_rows in cur.fetchall():
+                if not re.fullmatch(r"news_p\d{8}", name):
+                    continue
+
+                day = datetime.strptime(name[len("news_p"):], "%Y%m%d").date()
+                if day >= today:
+                    continue
+
+                cur.execute(f"ALTER TABLE news DETACH PARTITION {name};")
+                cur.execute(f"DROP TABLE {name};")
+                # Hangi kategorilerin etkilendiği bilinmiyor → tüm kategoriler
+                NewsModel._notify_changes(cur, "drop", [(None, None, None, estimated_rows)])
+                conn.commit()
+
+                result["dropped_partitions"] += 1
+                result["estimated_rows"] += estimated_rows
+                logger.info(f"🗑️ {name} partition'ı silindi (~{estimated_rows} satır)")
+
+            return result
 
         except Exception as e:
-            logger.error(f"❌ Tablo oluşturma hatası: {e}")
+            logger.error(f"❌ drop_expired_partitions hatası: {e}")
             if conn:
                 conn.rollback()
-            raise
+            return result
         finally:
             if conn:
+                cur.close() if 'cur' in locals() else None
                 put_db(conn)
 
+    @staticmethod
+    def _notify_changes(cur, op: str, summary) -> None:
+        """
+        summary: (category, min_id, max_id, count) satırları. Her kategori için
+        news_generations'taki sıra numarası artırılır ve news_changed kanalına
+        JSON payload gönderilir; ikisi de commit ile görünür olur.
+        """
+        # Satır kilitleri her transaction'da aynı sırayla alınır (deadlock yok)
+        for category, min_id, max_id, count in sorted(summary, key=lambda s: s[0] or "*"):
+            cur.execute("""
+                INSERT INTO news_generations (category, seq, changed_at)
+                VALUES (%s, nextval('news_change_seq'), clock_timestamp())
+                ON CONFLICT (category) DO UPDATE
+                SET seq = EXCLUDED.seq, changed_at = EXCLUDED.changed_at
+                RETURNING seq, changed_at;
+            """, (category or NewsModel.ALL_CATEGORIES_KEY,))
+            seq, changed_at = cur.fetchone()
+
+            payload = json.dumps({
+                "op": op,
+                "category": category,
+                "min_id": min_id,
+                "max_id": max_id,
+                "count": count,
+                "seq": seq,
+                "changed_at": changed_at.isoformat()
+            })
+            cur.execute("SELECT pg_notify(%s, %s);", (NewsModel.CHANGE_CHANNEL, payload))
+
+    @staticmethod
+    def get_generations() -> dict:
+        """news_generations: category ('*' dahil) → (seq, changed_at)."""
+        with db_cursor() as cur:
+            cur.execute("SELECT category, seq, changed_at FROM news_generations;")
+            return {category: (seq, changed_at) for category, seq, changed_at in cur.fetchall()}
+
+    @staticmethod
+    def expiry_bounds():
+        """
+        (son geçilen expires_at, sıradaki expires_at); yoksa None. Süresi dolan
+        haber bildirim üretmediği için Last-Modified ve cache anahtarı bunları kullanır.
+        """
+        with db_cursor(read_only=True) as cur:
+            cur.execute("""
+                SELECT (SELECT MAX(expires_at) FROM news WHERE expires_at <= NOW()),
+                       (SELECT MIN(expires_at) FROM news WHERE expires_at > NOW());
+            """)
+            row = cur.fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    @staticmethod
+    def _summarize_ids(rows) -> list:
+        """(id, category) satırlarından kategori başına (category, min, max, count)."""
+        summary = {}
+        for article_id, category in rows:
+            low, high, count = summary.get(category, (article_id, article_id, 0))
+            summary[category] = (min(low, article_id), max(high, article_id), count + 1)
+        return [(c, low, high, count) for c, (low, high, count) in summary.items()]
+
+    @staticmethod
+    def _url_hash(url: str) -> str:
+        # news.url_hash ve scraping_blacklist.url_hash aynı değeri taşır
+        return hashlib.md5(url.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _canonical_url(url: str):
+        """news.canonical_url değeri; boş veya çözümlenemeyen URL için None."""
+        try:
+            return canonicalize_url(url or "") or None
+        except ValueError as e:
+            # Bozuk host (örn. "http://[bad") tüm batch'i düşürmesin
+            logger.warning(f"⚠️  canonical_url hesaplanamadı ({url[:60]}): {e}")
+            return None
+
     @staticmethod
     def _generate_hash(title: str, url: str) -> str:
         combined = f"{title.lower().strip()}{url}"
         return hashlib.md5(combined.encode('utf-8')).hexdigest()
 
     @staticmethod
-    def save_article(article: dict, category: str, api_source: str = "unknown") -> bool:
+    def _parse_published(published_raw, now_utc: datetime) -> datetime:
+        if isinstance(published_raw, datetime):
+            if published_raw.tzinfo is None:
+                return published_raw.replace(tzinfo=pytz.UTC)
+            return published_raw
+
+        if isinstance(published_raw, str):
+            try:
+                return datetime.fromisoformat(published_raw.replace("Z", "+00:00"))
+            except Exception:
+                try:
+                    from dateutil import parser
+                    parsed = parser.parse(published_raw)
+                    if parsed.tzinfo is None:
+                        return parsed.replace(tzinfo=pytz.UTC)
+                    return parsed
+                except:
+                    return now_utc
+
+        return now_utc
+
+    @staticmethod
+    def _prepare_row(article: dict, category: str, api_source: str,
+                     now_utc: datetime, expires: datetime):
+        title = (article.get("title") or "").strip()
+        description = (article.get("description") or "").strip()
+        url = (article.get("url") or "").strip()
+        image = article.get("image") or article.get("urlToImage")
+
+        if not title or not url:
+            return None
+
+        published = NewsModel._parse_published(article.get("publishedAt"), now_utc)
+        title_url_hash = NewsModel._generate_hash(title, url)
+
+        return (
+            category,
+            title,
+            description,
+            url,
+            image,
+            api_source,
+            published,
+            expires,
+            title_url_hash,
+            now_utc,
+            False,
+            NewsModel._url_hash(url),
+            NewsModel._canonical_url(url)
+        )
+
+    @staticmethod
+    def _insert_rows(rows: list) -> set:
+        """
+        Satırları tek bağlantı ve tek multi-row INSERT ile yazar.
+        Eklenen satırların title_url_hash değerlerini döndürür.
+        """
+        if not rows:
+            return set()
+
         conn = None
         try:
             conn = get_db()
             cur = conn.cursor()
 
-            now_utc = datetime.now(pytz.UTC)
-            expires = now_utc + timedelta(days=Config.NEWS_EXPIRATION_DAYS)
-
-            title = (article.get("title") or "").strip()
-            description = (article.get("description") or "").strip()
-            url = (article.get("url") or "").strip()
-            image = article.get("image") or article.get("urlToImage")
-
-            published_raw = article.get("publishedAt")
-
-            published = None
-            if isinstance(published_raw, datetime):
-                if published_raw.tzinfo is None:
-                    published = published_raw.replace(tzinfo=pytz.UTC)
-                else:
-                    published = published_raw
-            elif isinstance(published_raw, str):
-                try:
-                    published = datetime.fromisoformat(published_raw.replace("Z", "+00:00"))
-                except Exception:
-                    try:
-                        from dateutil import parser
-                        parsed = parser.parse(published_raw)
-                        if parsed.tzinfo is None:
-                            published = parsed.replace(tzinfo=pytz.UTC)
-                        else:
-                            published = parsed
-                    except:
-                        published = now_utc
+            if NewsModel.is_partitioned():
+                # Partition'lı tabloda UNIQUE index partition kolonunu (saved_at)
+                # içermek zorunda, title_url_hash / canonical_url tek başına
+                # unique olamaz. Mevcut kayıtlar NOT EXISTS ile elenir; eşzamanlı
+                # save_bulk'ların (cron + manuel /update) birbirinin henüz commit
+                # edilmemiş satırlarını kaçırmaması için INSERT'ler transaction
+                # sonuna kadar tutulan advisory lock ile sıraya girer.
+                cur.execute("SELECT pg_advisory_xact_lock(%s);", (NewsModel.INSERT_LOCK_KEY,))
+                query = f"""
+                    INSERT INTO news ({NewsModel.INSERT_COLUMNS})
+                    SELECT * FROM (VALUES %s) AS v ({NewsModel.INSERT_COLUMNS})
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM news n WHERE n.title_url_hash = v.title_url_hash
+                    )
+                    AND NOT EXISTS (
+                        SELECT 1 FROM news n WHERE n.canonical_url = v.canonical_url
+                    )
+                    RETURNING title_url_hash, id, category;
+                """
             else:
-                published = now_utc
-
-            if not title or not url:
-                logger.warning("⚠️ Boş title veya url yüzünden haber atlandı")
-                return False
+                # Hedefsiz ON CONFLICT: title_url_hash ve canonical_url unique index'leri
+                query = f"""
+                    INSERT INTO news ({NewsModel.INSERT_COLUMNS})
+                    VALUES %s
+                    ON CONFLICT DO NOTHING
+                    RETURNING title_url_hash, id, category;
+                """
 
-            title_url_hash = NewsModel._generate_hash(title, url)
+            returned = execute_values(cur, query, rows, page_size=len(rows), fetch=True)
 
-            cur.execute("""
-                INSERT INTO news (
-                    category, title, description, url,
-                    image, source, published, expires_at, title_url_hash, saved_at
+            if returned:
+                NewsModel._notify_changes(
+                    cur, "insert", NewsModel._summarize_ids((r[1], r[2]) for r in returned)
                 )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (title_url_hash) DO NOTHING
-                RETURNING id;
-            """, (
-                category,
-                title,
-                description,
-                url,
-                image,
-                api_source,
-                published,
-                expires,
-                title_url_hash,
-                now_utc
-            ))
 
-            result = cur.fetchone()
             conn.commit()
+            return {r[0] for r in returned}
 
-            if result:
-                logger.debug(f"✅ Kaydedildi: {title[:50]}...")
-                return True
-            else:
-                logger.debug(f"⏭️ Duplicate atlandı: {title[:50]}...")
-                return False
-
-        except Exception as e:
-            logger.error(f"❌ Haber kaydedilemedi: {e}")
+        except Exception:
             if conn:
                 try:
                     conn.rollback()
                 except:
                     pass
-            return False
+            raise
         finally:
             if conn:
+                cur.close() if 'cur' in locals() else None
                 put_db(conn)
 
     @staticmethod
-    def save_bulk(articles: list, category: str, api_source: str = "unknown"):
+    def save_article(article: dict, category: str, api_source: str = "unknown") -> bool:
+        stats = NewsModel.save_bulk([article], category, api_source, log_summary=False)
+        return stats["saved"] == 1
+
+    @staticmethod
+    def save_bulk(articles: list, category: str, api_source: str = "unknown",
+                  log_summary: bool = True):
         stats = {"saved": 0, "duplicates": 0, "errors": 0}
 
+        now_utc = datetime.now(pytz.UTC)
+        expires = now_utc + timedelta(days=Config.NEWS_EXPIRATION_DAYS)
+
+        rows = []
+        seen_hashes = set()
+        seen_canonical = set()
         for a in articles:
-            if not a.get("title") or not a.get("url"):
+            row = NewsModel._prepare_row(a, category, api_source, now_utc, expires)
+            if row is None:
+                logger.warning("⚠️ Boş title veya url yüzünden haber atlandı")
                 stats["errors"] += 1
                 continue
 
-            ok = NewsModel.save_article(a, category, api_source)
-
-            if ok:
-                stats["saved"] += 1
-            else:
+            # Aynı batch içinde tekrar eden hash / canonical URL tek satır olarak yazılır
+            if row[8] in seen_hashes or (row[12] and row[12] in seen_canonical):
                 stats["duplicates"] += 1
+                continue
+            seen_hashes.add(row[8])
+            if row[12]:
+                seen_canonical.add(row[12])
+            rows.append(row)
 
-        logger.info(
-            f"📊 {api_source} / {category}: "
-            f"{stats['saved']} kaydedildi, "
-            f"{stats['duplicates']} duplicate, "
-            f"{stats['errors']} hata"
-        )
+        if rows:
+            try:
+                saved_hashes = NewsModel._insert_rows(rows)
+            except Exception as e:
+                logger.error(f"❌ Toplu kayıt hatası ({api_source} / {category}): {e}")
+                stats["errors"] += len(rows)
+                return stats
+
+            for row in rows:
+                title, title_url_hash = row[1], row[8]
+                if title_url_hash in saved_hashes:
+                    stats["saved"] += 1
+                    logger.debug(f"✅ Kaydedildi: {title[:50]}...")
+                else:
+                    stats["duplicates"] += 1
+                    logger.debug(f"⏭️ Duplicate atlandı: {title[:50]}...")
+
+        if log_summary:
+            logger.info(
+                f"📊 {api_source} / {category}: "
+                f"{stats['saved']} kaydedildi, "
+                f"{stats['duplicates']} duplicate, "
+                f"{stats['errors']} hata"
+            )
 
         return stats
 
+    @staticmethod
+    def find_near_duplicates(articles: list, threshold: int = None, window_hours: int = None) -> set:
+        """
+        Son window_hours saatte kaydedilmiş haberlerle başlığı trigram benzerliği
+        threshold (%) üstünde olan veya canonical URL'si aynı olan makalelerin index'lerini
+        döndürür. Tüm batch tek sorguda kontrol edilir (GIN trigram index).
+        """
+        if not articles:
+            return set()
+
+        threshold = threshold or Config.SIMILARITY_THRESHOLD
+        window_hours = window_hours or Config.DUPLICATE_WINDOW_HOURS
+
+        titles = [(a.get("title") or "") for a in articles]
+        canonical_urls = [NewsModel._canonical_url(a.get("url")) for a in articles]
+
+        conn = None
+        try:
+            conn = get_db()
+            cur = conn.cursor()
+
+            # % operatörü bu eşiği kullanır; SET LOCAL gibi transaction sonunda sıfırlanır
+            cur.execute(
+                "SELECT set_config('pg_trgm.similarity_threshold', %s, true);",
+                (str(threshold / 100),)
+            )
+            cur.execute("""
+                SELECT t.idx
+                FROM UNNEST(%s::text[], %s::text[]) WITH ORDINALITY AS t (title, canonical_url, idx)
+                WHERE EXISTS (
+                    SELECT 1 FROM news n
+                    WHERE n.saved_at > NOW() - %s * INTERVAL '1 hour'
+                      AND (
+                          n.title_norm %% LOWER(REGEXP_REPLACE(BTRIM(t.title), '\\s+', ' ', 'g'))
+                          OR n.canonical_url = t.canonical_url
+                      )
+                );
+            """, (titles, canonical_urls, window_hours))
+
+            found = {row[0] - 1 for row in cur.fetchall()}
+            conn.commit()
+            return found
+
+        except PoolExhaustedError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ find_near_duplicates hatası: {e}")
+            if conn:
+                conn.rollback()
+            return set()
+        finally:
+            if conn:
+                cur.close() if 'cur' in locals() else None
+                put_db(conn)
+
     @staticmethod
     def delete_expired():
         conn = None
@@ -274,11 +544,21 @@ class NewsModel:
             conn = get_db()
             cur = conn.cursor()
 
-            cur.execute("DELETE FROM news WHERE expires_at < NOW() RETURNING id;")
-            rows = cur.fetchall()
+            cur.execute("""
+                WITH deleted AS (
+                    DELETE FROM news WHERE expires_at < NOW()
+                    RETURNING id, category
+                )
+                SELECT category, MIN(id), MAX(id), COUNT(*)
+                FROM deleted
+                GROUP BY category;
+            """)
+            summary = cur.fetchall()
+            count = sum(row[3] for row in summary)
+
+            NewsModel._notify_changes(cur, "delete", summary)
             conn.commit()
 
-            count = len(rows)
             if count > 0:
                 logger.info(f"🗑️ {count} eski haber silindi")
 
@@ -294,187 +574,562 @@ class NewsModel:
                 put_db(conn)
 
     @staticmethod
-    def get_news(category: str = None, limit: int = 50, offset: int = 0):
+    def delete_expired_batched(batch_size: int = None, time_budget: float = None) -> dict:
+        """
+        Süresi dolmuş haberleri id chunk'ları halinde siler, her chunk ayrı commit edilir.
+        Böylece tek dev transaction statement_timeout'a takılıp geri alınmaz ve
+        kilitler kısa tutulur. time_budget (saniye) dolunca kalan satırlar bir sonraki
+        çalışmaya bırakılır.
+        """
+        batch_size = batch_size or Config.CLEANUP_BATCH_SIZE
+        time_budget = time_budget or Config.CLEANUP_TIME_BUDGET
+
+        result = {"deleted_count": 0, "chunks": 0, "completed": False, "duration_seconds": 0.0}
+        started = time.monotonic()
+
         conn = None
         try:
             conn = get_db()
             cur = conn.cursor()
 
-            if category:
-                query = """
-                    SELECT id, category, title, description, full_content,
-                           url, image, source, published, saved_at
-                    FROM news
-                    WHERE category = %s AND expires_at > NOW()
-                    ORDER BY saved_at DESC
-                    LIMIT %s OFFSET %s;
-                """
-                cur.execute(query, (category, limit, offset))
-            else:
-                query = """
-                    SELECT id, category, title, description, full_content,
-                           url, image, source, published, saved_at
-                    FROM news
-                    WHERE expires_at > NOW()
-                    ORDER BY saved_at DESC
-                    LIMIT %s OFFSET %s;
-                """
-                cur.execute(query, (limit, offset))
-
-            rows = cur.fetchall()
-
-            data = []
-            for r in rows:
-                data.append({
-                    "id": r[0],
-                    "category": r[1],
-                    "title": r[2],
-                    "description": r[3],
-                    "full_content": r[4],
-                    "url": r[5],
-                    "image": r[6],
-                    "source": r[7],
-                    "published": r[8].isoformat() if r[8] else None,
-                    "saved_at": r[9].isoformat() if r[9] else None,
-                })
-
-            return data
+            while True:
+                cur.execute("""
+                    WITH deleted AS (
+                        DELETE FROM news
+                        WHERE id IN (
+                            SELECT id FROM news
+                            WHERE expires_at < NOW()
+                            LIMIT %s
+                        )
+                        RETURNING id, category
+                    )
+                    SELECT category, MIN(id), MAX(id), COUNT(*)
+                    FROM deleted
+                    GROUP BY category;
+                """, (batch_size,))
+                summary = cur.fetchall()
+                deleted = sum(row[3] for row in summary)
+
+                NewsModel._notify_changes(cur, "delete", summary)
+                conn.commit()
+
+                if deleted > 0:
+                    result["chunks"] += 1
+                    result["deleted_count"] += deleted
+                    logger.debug(f"🗑️ Chunk {result['chunks']}: {deleted} satır silindi")
+
+                if deleted < batch_size:
+                    result["completed"] = True
+                    break
+
+                if time.monotonic() - started >= time_budget:
+                    logger.warning(
+                        f"⏱️ Temizlik süre limiti ({time_budget}s) doldu, "
+                        f"kalan satırlar sonraki çalışmaya bırakıldı"
+                    )
+                    break
+
+            if result["deleted_count"] > 0:
+                logger.info(
+                    f"🗑️ {result['deleted_count']} eski haber silindi "
+                    f"({result['chunks']} chunk)"
+                )
 
         except Exception as e:
-            logger.exception(f"❌ Haber getirme hatası")
-            return []
+            logger.error(f"❌ Chunk'lı silme hatası: {e}")
+            if conn:
+                conn.rollback()
+            result["error"] = str(e)
         finally:
             if conn:
                 cur.close() if 'cur' in locals() else None
                 put_db(conn)
 
+        result["duration_seconds"] = round(time.monotonic() - started, 3)
+        return result
+
     @staticmethod
-    def get_scraped_only(category: str = None, limit: int = 50, offset: int = 0):
-        conn = None
+    def _row_to_dict(r, view: str = "full") -> dict:
+        content = r[4]
+        if view != "list" and content is None and len(r) > 10 and r[10] is not None:
+            content = NewsModel.decompress_content(r[10])
+
+        return {
+            "id": r[0],
+            "category": r[1],
+            "title": r[2],
+            "description": r[3],
+            ("excerpt" if view == "list" else "full_content"): content,
+            "url": r[5],
+            "image": r[6],
+            "source": r[7],
+            # datetime olarak kalır; JSON provider ISO 8601 yazar
+            "published": r[8],
+            "saved_at": r[9],
+        }
+
+    @staticmethod
+    def encode_cursor(saved_at: str, article_id: int) -> str:
+        raw = f"{saved_at}|{article_id}"
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_cursor(cursor: str):
+        """
+        Opaque cursor'ı (saved_at, id) ikilisine çevirir.
+        Bozuk cursor için ValueError fırlatır.
+        """
         try:
-            conn = get_db()
-            cur = conn.cursor()
+            padded = cursor + "=" * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+            saved_at_raw, id_raw = raw.rsplit("|", 1)
+            saved_at = datetime.fromisoformat(saved_at_raw)
+            if saved_at.tzinfo is None:
+                saved_at = saved_at.replace(tzinfo=pytz.UTC)
+            return saved_at, int(id_raw)
+        except Exception:
+            raise ValueError(f"Geçersiz cursor: {cursor}")
 
-            if category:
-                query = """
-                    SELECT id, category, title, description, full_content,
-                           url, image, source, published, saved_at
-                    FROM news
-                    WHERE category = %s 
-                      AND expires_at > NOW()
-                      AND full_content IS NOT NULL
-                      AND LENGTH(full_content) > 100
-                    ORDER BY saved_at DESC
-                    LIMIT %s OFFSET %s;
-                """
-                cur.execute(query, (category, limit, offset))
-            else:
-                query = """
-                    SELECT id, category, title, description, full_content,
-                           url, image, source, published, saved_at
-                    FROM news
-                    WHERE expires_at > NOW()
-                      AND full_content IS NOT NULL
-                      AND LENGTH(full_content) > 100
-                    ORDER BY saved_at DESC
-                    LIMIT %s OFFSET %s;
-                """
-                cur.execute(query, (limit, offset))
+    @staticmethod
+    def next_cursor(rows: list, limit: int):
+        """Sayfa doluysa son satırdan bir sonraki sayfanın cursor'ını üretir."""
+        if not rows or len(rows) < limit:
+            return None
 
-            rows = cur.fetchall()
+        last = rows[-1]
+        saved_at = last.get("saved_at")
+        if not saved_at:
+            return None
 
-            data = []
-            for r in rows:
-                data.append({
-                    "id": r[0],
-                    "category": r[1],
-                    "title": r[2],
-                    "description": r[3],
-                    "full_content": r[4],
-                    "url": r[5],
-                    "image": r[6],
-                    "source": r[7],
-                    "published": r[8].isoformat() if r[8] else None,
-                    "saved_at": r[9].isoformat() if r[9] else None,
-                })
+        if isinstance(saved_at, datetime):
+            saved_at = saved_at.isoformat()
+
+        return NewsModel.encode_cursor(saved_at, last["id"])
+
+    @staticmethod
+    def check_view(view: str) -> str:
+        if view not in NewsModel.LIST_VIEWS:
+            raise ValueError(f"Geçersiz view: {view} (full veya list)")
+        return view
+
+    @staticmethod
+    def build_list_query(conditions: list, params: list, limit: int, offset: int = 0,
+                         cursor: str = None, view: str = "full"):
+        """
+        Liste sorgusunu (%s placeholder'lı) ve parametrelerini üretir.
+        Senkron ve async okuma yolu aynı sorguyu kullanır.
+        Bozuk cursor veya view için ValueError fırlatır.
+        """
+        NewsModel.check_view(view)
+        columns = NewsModel.LIST_COLUMNS_LIGHT if view == "list" else NewsModel.LIST_COLUMNS
+
+        conditions = list(conditions)
+        params = list(params)
+
+        if cursor:
+            after_saved_at, after_id = NewsModel.decode_cursor(cursor)
+            conditions.append("(saved_at, id) < (%s, %s)")
+            params.extend([after_saved_at, after_id])
+
+        query = f"""
+            SELECT {columns}
+            FROM news
+            WHERE {" AND ".join(conditions)}
+            ORDER BY saved_at DESC, id DESC
+            LIMIT %s
+        """
+        params.append(limit)
+
+        if offset and not cursor:
+            query += " OFFSET %s"
+            params.append(offset)
+
+        return query, params
+
+    @staticmethod
+    def _fetch_list(conditions: list, params: list, limit: int, offset: int = 0,
+                    cursor: str = None, label: str = "liste", view: str = "full"):
+        # Cursor/view hatası (ValueError) route'a kadar çıkar → 400
+        query, params = NewsModel.build_list_query(conditions, params, limit, offset, cursor, view)
+
+        try:
+            with db_cursor(read_only=True) as cur:
+                cur.execute(query, params)
+                rows = cur.fetchall()
 
-            return data
+            return [NewsModel._row_to_dict(r, view) for r in rows]
 
+        except PoolExhaustedError:
+            raise
         except Exception as e:
-            logger.exception(f"❌ Scraped haberler getirme hatası")
+            logger.exception(f"❌ Haber getirme hatası ({label})")
             return []
-        finally:
-            if conn:
-                cur.close() if 'cur' in locals() else None
-                put_db(conn)
 
     @staticmethod
-    def get_scraped_after(after_date: str, category: str = None, limit: int = 50):
-        conn = None
-        try:
-            conn = get_db()
-            cur = conn.cursor()
+    def _iso_sql(column: str) -> str:
+        # datetime.isoformat() ile aynı biçim: mikro saniye 0 ise kesir yazılmaz
+        return f"""CASE WHEN DATE_TRUNC('second', {column}) = {column}
+            THEN TO_CHAR({column}, 'YYYY-MM-DD"T"HH24:MI:SSTZH:TZM')
+            ELSE TO_CHAR({column}, 'YYYY-MM-DD"T"HH24:MI:SS.USTZH:TZM') END"""
 
+    @staticmethod
+    def build_list_json_query(conditions: list, params: list, limit: int, offset: int = 0,
+                              cursor: str = None, view: str = "full"):
+        """
+        Liste sayfasını Postgres'te JSON dizisi olarak üreten sorgu (anahtarlar
+        jsonify gibi alfabetik). Tek satır döner: (docs, count, son saved_at,
+        son id, python_gerekli); sonucu list_json_page() sayfaya çevirir.
+        """
+        query, params = NewsModel.build_list_query(conditions, params, limit, offset, cursor, view)
+
+        content_key = "excerpt" if view == "list" else "full_content"
+        needs_python = (
+            "FALSE" if view == "list"
+            else "l.full_content IS NULL AND l.full_content_z IS NOT NULL"
+        )
+
+        sql = f"""
+            SELECT COALESCE(STRING_AGG(p.doc, ',' ORDER BY p.saved_at DESC, p.id DESC), ''),
+                   COUNT(*),
+                   (ARRAY_AGG(p.saved_at ORDER BY p.saved_at, p.id))[1],
+                   (ARRAY_AGG(p.id ORDER BY p.saved_at, p.id))[1],
+                   COALESCE(BOOL_OR(p.needs_python), FALSE)
+            FROM (
+                SELECT l.saved_at, l.id,
+                       {needs_python} AS needs_python,
+                       (
+                           SELECT ROW_TO_JSON(d)::text FROM (
+                               SELECT l.category, l.description, l.{content_key} AS {content_key},
+                                      l.id, l.image, {NewsModel._iso_sql("l.published")} AS published,
+                                      {NewsModel._iso_sql("l.saved_at")} AS saved_at,
+                                      l.source, l.title, l.url
+                           ) AS d
+                       ) AS doc
+                FROM ({query}) AS l
+            ) AS p;
+        """
+        return sql, params
+
+    @staticmethod
+    def list_json_page(row, limit: int):
+        """
+        build_list_json_query() sonucu → {"news", "count", "next_cursor"}.
+        Sıkıştırılmış gövde içeren sayfada Python'da açmak gerektiği için None.
+        """
+        docs, count, last_saved_at, last_id, fallback = row
+
+        if fallback:
+            return None
+
+        next_cursor = None
+        if count and count >= limit and last_saved_at:
+            next_cursor = NewsModel.encode_cursor(last_saved_at.isoformat(), last_id)
+
+        return {"news": RawJSON(f"[{docs}]"), "count": count, "next_cursor": next_cursor}
+
+    @staticmethod
+    def _fetch_list_json(conditions: list, params: list, limit: int, offset: int = 0,
+                         cursor: str = None, label: str = "liste", view: str = "full"):
+        sql, params = NewsModel.build_list_json_query(conditions, params, limit, offset, cursor, view)
+
+        with db_cursor(read_only=True) as cur:
+            cur.execute(sql, params)
+            return NewsModel.list_json_page(cur.fetchone(), limit)
+
+    @staticmethod
+    def use_sql_render(view: str, sql_render: bool) -> bool:
+        # Sıkıştırma açıkken view=full sayfalarının çoğu sıkıştırılmış gövde
+        # içerir; SQL render sonucu atılıp sorgu Python'da tekrarlanacağı için
+        # baştan Python yoluna gidilir
+        return sql_render and (view == "list" or Config.CONTENT_COMPRESSION == "none")
+
+    @staticmethod
+    def _fetch_page(conditions: list, params: list, limit: int, offset: int = 0,
+                    cursor: str = None, label: str = "liste", view: str = "full",
+                    sql_render: bool = False) -> dict:
+        """
+        {"news", "count", "next_cursor"} döndürür. sql_render=True ise news
+        Postgres'te üretilmiş RawJSON olur; mümkün değilse Python satırlarına düşer.
+        """
+        if NewsModel.use_sql_render(view, sql_render):
             try:
-                after_dt = datetime.fromisoformat(after_date.replace("Z", "+00:00"))
-            except:
-                logger.error(f"❌ Geçersiz tarih formatı: {after_date}")
-                return []
+                page = NewsModel._fetch_list_json(
+                    conditions, params, limit, offset, cursor, label, view
+                )
+                if page is not None:
+                    return page
+            except (PoolExhaustedError, ValueError):
+                raise
+            except Exception as e:
+                logger.exception(f"❌ SQL JSON render hatası ({label}), Python'a düşülüyor")
 
-            if category:
-                query = """
-                    SELECT id, category, title, description, full_content,
-                           url, image, source, published, saved_at
-                    FROM news
-                    WHERE category = %s
-                      AND saved_at > %s
-                      AND expires_at > NOW()
-                      AND full_content IS NOT NULL
-                      AND LENGTH(full_content) > 100
-                    ORDER BY saved_at DESC
-                    LIMIT %s;
-                """
-                cur.execute(query, (category, after_dt, limit))
-            else:
-                query = """
-                    SELECT id, category, title, description, full_content,
-                           url, image, source, published, saved_at
-                    FROM news
-                    WHERE saved_at > %s
-                      AND expires_at > NOW()
-                      AND full_content IS NOT NULL
-                      AND LENGTH(full_content) > 100
-                    ORDER BY saved_at DESC
-                    LIMIT %s;
-                """
-                cur.execute(query, (after_dt, limit))
+        rows = NewsModel._fetch_list(conditions, params, limit, offset, cursor, label, view)
+        return {"news": rows, "count": len(rows), "next_cursor": NewsModel.next_cursor(rows, limit)}
 
-            rows = cur.fetchall()
+    @staticmethod
+    def news_filter(category: str = None):
+        conditions = ["expires_at > NOW()"]
+        params = []
 
-            data = []
-            for r in rows:
-                data.append({
-                    "id": r[0],
-                    "category": r[1],
-                    "title": r[2],
-                    "description": r[3],
-                    "full_content": r[4],
-                    "url": r[5],
-                    "image": r[6],
-                    "source": r[7],
-                    "published": r[8].isoformat() if r[8] else None,
-                    "saved_at": r[9].isoformat() if r[9] else None,
-                })
+        if category:
+            conditions.insert(0, "category = %s")
+            params.append(category)
 
-            return data
+        return conditions, params
 
-        except Exception as e:
-            logger.exception(f"❌ get_scraped_after hatası")
+    @staticmethod
+    def scraped_filter(category: str = None):
+        conditions = [
+            "expires_at > NOW()",
+            "is_scraped",
+        ]
+        params = []
+
+        if category:
+            conditions.insert(0, "category = %s")
+            params.append(category)
+
+        return conditions, params
+
+    @staticmethod
+    def scraped_after_filter(after_dt: datetime, category: str = None):
+        conditions = [
+            "saved_at > %s",
+            "expires_at > NOW()",
+            "is_scraped",
+        ]
+        params = [after_dt]
+
+        if category:
+            conditions.insert(0, "category = %s")
+            params.insert(0, category)
+
+        return conditions, params
+
+    @staticmethod
+    def get_news_page(category: str = None, limit: int = 50, offset: int = 0, cursor: str = None,
+                      view: str = "full", sql_render: bool = False) -> dict:
+        conditions, params = NewsModel.news_filter(category)
+        return NewsModel._fetch_page(conditions, params, limit, offset, cursor,
+                                     label="get_news", view=view, sql_render=sql_render)
+
+    @staticmethod
+    def get_scraped_page(category: str = None, limit: int = 50, offset: int = 0, cursor: str = None,
+                         view: str = "full", sql_render: bool = False) -> dict:
+        conditions, params = NewsModel.scraped_filter(category)
+        return NewsModel._fetch_page(conditions, params, limit, offset, cursor,
+                                     label="get_scraped_only", view=view, sql_render=sql_render)
+
+    @staticmethod
+    def get_scraped_after_page(after_date: str, category: str = None, limit: int = 50,
+                               view: str = "full", sql_render: bool = False) -> dict:
+        NewsModel.check_view(view)
+
+        after_dt = NewsModel.parse_after_date(after_date)
+        if after_dt is None:
+            return {"news": [], "count": 0, "next_cursor": None}
+
+        conditions, params = NewsModel.scraped_after_filter(after_dt, category)
+        return NewsModel._fetch_page(conditions, params, limit,
+                                     label="get_scraped_after", view=view, sql_render=sql_render)
+
+    @staticmethod
+    def parse_after_date(after_date: str):
+        """ISO tarih → datetime, geçersizse None."""
+        try:
+            return datetime.fromisoformat(after_date.replace("Z", "+00:00"))
+        except:
+            logger.error(f"❌ Geçersiz tarih formatı: {after_date}")
+            return None
+
+    @staticmethod
+    def get_news(category: str = None, limit: int = 50, offset: int = 0, cursor: str = None,
+                 view: str = "full"):
+        conditions, params = NewsModel.news_filter(category)
+        return NewsModel._fetch_list(conditions, params, limit, offset, cursor,
+                                     label="get_news", view=view)
+
+    @staticmethod
+    def get_scraped_only(category: str = None, limit: int = 50, offset: int = 0, cursor: str = None,
+                         view: str = "full"):
+        conditions, params = NewsModel.scraped_filter(category)
+        return NewsModel._fetch_list(conditions, params, limit, offset, cursor,
+                                     label="get_scraped_only", view=view)
+
+    @staticmethod
+    def get_scraped_after(after_date: str, category: str = None, limit: int = 50,
+                          view: str = "full"):
+        NewsModel.check_view(view)
+
+        after_dt = NewsModel.parse_after_date(after_date)
+        if after_dt is None:
             return []
-        finally:
-            if conn:
-                cur.close() if 'cur' in locals() else None
-                put_db(conn)
+
+        conditions, params = NewsModel.scraped_after_filter(after_dt, category)
+        return NewsModel._fetch_list(conditions, params, limit,
+                                     label="get_scraped_after", view=view)
+
+    @staticmethod
+    def encode_search_cursor(rank: float, article_id: int) -> str:
+        raw = f"{rank!r}|{article_id}"
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def decode_search_cursor(cursor: str):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+            rank_raw, id_raw = raw.rsplit("|", 1)
+            return float(rank_raw), int(id_raw)
+        except Exception:
+            raise ValueError(f"Geçersiz cursor: {cursor}")
+
+    @staticmethod
+    def search(query: str, category: str = None, limit: int = 20, cursor: str = None):
+        """
+        search_vector (GIN) üzerinde websearch_to_tsquery ile arama.
+        Sıralama (rank, id) DESC; cursor bir önceki sayfanın son (rank, id) ikilisi.
+        ts_headline sadece LIMIT sonrası kalan satırlar için hesaplanır;
+        highlight HTML-escape edilmiş metindir, tek markup eşleşmelerdeki <b>'dir.
+        Döner: (sonuçlar, next_cursor). Bozuk cursor için ValueError.
+        """
+        conditions = [
+            "search_vector @@ q.query",
+            "expires_at > NOW()",
+        ]
+
+        # Kaynak metindeki işaret karakterleri silinir, aksi halde <b> olurdu
+        markers = NewsModel.HIGHLIGHT_START + NewsModel.HIGHLIGHT_STOP
+        headline_options = (
+            f"StartSel={NewsModel.HIGHLIGHT_START}, StopSel={NewsModel.HIGHLIGHT_STOP}, "
+            f"MaxWords=35, MinWords=15, MaxFragments=2"
+        )
+        # Sıra SQL'deki %s sırasıdır: sorgu, ts_headline, WHERE, LIMIT
+        params = [query, markers, headline_options]
+
+        if category:
+            conditions.append("category = %s")
+            params.append(category)
+
+        if cursor:
+            after_rank, after_id = NewsModel.decode_search_cursor(cursor)
+            conditions.append("(ts_rank(search_vector, q.query), id) < (%s::real, %s)")
+            params.extend([after_rank, after_id])
+
+        params.append(limit)
+
+        sql = f"""
+            WITH q AS (SELECT websearch_to_tsquery('turkish', %s) AS query)
+            SELECT page.id, page.category, page.title, page.description, page.excerpt,
+                   page.url, page.image, page.source, page.published, page.saved_at,
+                   page.rank,
+                   ts_headline(
+                       'turkish',
+                       translate(COALESCE(n.full_content, page.excerpt, page.description, ''),
+                                 %s, ''),
+                       q.query,
+                       %s
+                   ) AS highlight
+            FROM (
+                SELECT {NewsModel.LIST_COLUMNS_LIGHT},
+                       ts_rank(search_vector, q.query) AS rank
+                FROM news, q
+                WHERE {" AND ".join(conditions)}
+                ORDER BY rank DESC, id DESC
+                LIMIT %s
+            ) AS page
+            CROSS JOIN q
+            JOIN news n ON n.id = page.id
+            ORDER BY page.rank DESC, page.id DESC;
+        """
+
+        try:
+            with db_cursor(read_only=True) as cur:
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+
+        except PoolExhaustedError:
+            raise
+        except Exception as e:
+            logger.exception(f"❌ Arama hatası")
+            return [], None
+
+        results = []
+        for r in rows:
+            item = NewsModel._row_to_dict(r[:10], view="list")
+            item["rank"] = r[10]
+            item["highlight"] = NewsModel._render_highlight(r[11])
+            results.append(item)
+
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = NewsModel.encode_search_cursor(rows[-1][10], rows[-1][0])
+
+        return results, next_cursor
+
+    @staticmethod
+    def _render_highlight(headline: str):
+        """Scrape edilmiş metindeki HTML escape edilir, eşleşmeler <b> ile sarılır."""
+        if headline is None:
+            return None
+
+        return (
+            html.escape(headline)
+            .replace(NewsModel.HIGHLIGHT_START, "<b>")
+            .replace(NewsModel.HIGHLIGHT_STOP, "</b>")
+        )
+
+    @staticmethod
+    def get_by_id(article_id: int, use_cache: bool = True):
+        """
+        Tek haberi full_content dahil döndürür (süresi dolmuşsa / yoksa None).
+        Sonuç Config.DETAIL_CACHE_TTL saniye, en fazla
+        Config.DETAIL_CACHE_MAX_ENTRIES kayıt olarak process içinde tutulur.
+        """
+        if use_cache:
+            with NewsModel._detail_lock:
+                entry = NewsModel._detail_cache.get(article_id)
+                if entry and time.monotonic() - entry[0] < Config.DETAIL_CACHE_TTL:
+                    NewsModel._detail_cache.move_to_end(article_id)
+                    return entry[1]
+
+        with db_cursor(read_only=True) as cur:
+            cur.execute(f"""
+                SELECT {NewsModel.LIST_COLUMNS}, excerpt
+                FROM news
+                WHERE id = %s AND expires_at > NOW();
+            """, (article_id,))
+            row = cur.fetchone()
+
+        if not row:
+            return None
+
+        article = NewsModel._row_to_dict(row)
+        article["excerpt"] = row[11]
+
+        with NewsModel._detail_lock:
+            NewsModel._detail_cache[article_id] = (time.monotonic(), article)
+            NewsModel._detail_cache.move_to_end(article_id)
+            while len(NewsModel._detail_cache) > Config.DETAIL_CACHE_MAX_ENTRIES:
+                NewsModel._detail_cache.popitem(last=False)
+
+        return article
+
+    @staticmethod
+    def _invalidate_detail(article_id: int):
+        with NewsModel._detail_lock:
+            NewsModel._detail_cache.pop(article_id, None)
+
+    @staticmethod
+    def invalidate_detail_range(min_id: int = None, max_id: int = None):
+        """Başka worker'dan gelen değişiklik bildirimi; aralık yoksa tüm cache."""
+        with NewsModel._detail_lock:
+            if min_id is None or max_id is None:
+                NewsModel._detail_cache.clear()
+                return
+
+            for article_id in [k for k in NewsModel._detail_cache if min_id <= k <= max_id]:
+                del NewsModel._detail_cache[article_id]
 
     @staticmethod
     def get_unscraped(limit: int = 15, exclude_blacklist: bool = True):
@@ -487,11 +1142,11 @@ class NewsModel:
                 query = """
                     SELECT n.id, n.title, n.url, n.source, n.image, n.published
                     FROM news n
-                    WHERE (n.full_content IS NULL OR LENGTH(n.full_content) < 100)
+                    WHERE NOT n.is_scraped
                       AND n.expires_at > NOW()
                       AND NOT EXISTS (
                           SELECT 1 FROM scraping_blacklist b 
-                          WHERE b.url_hash = MD5(n.url)
+                          WHERE b.url_hash = n.url_hash
                       )
                     ORDER BY n.saved_at DESC
                     LIMIT %s;
@@ -500,7 +1155,7 @@ class NewsModel:
                 query = """
                     SELECT id, title, url, source, image, published
                     FROM news
-                    WHERE (full_content IS NULL OR LENGTH(full_content) < 100)
+                    WHERE NOT is_scraped
                       AND expires_at > NOW()
                     ORDER BY saved_at DESC
                     LIMIT %s;
@@ -517,11 +1172,13 @@ class NewsModel:
                     "url": r[2],
                     "source": r[3],
                     "image": r[4],
-                    "published": r[5].isoformat() if r[5] else None
+                    "published": r[5]
                 })
             
             return articles
             
+        except PoolExhaustedError:
+            raise
         except Exception as e:
             logger.exception("❌ get_unscraped hatası")
             return []
@@ -531,38 +1188,278 @@ class NewsModel:
                 put_db(conn)
 
     @staticmethod
-    def update_full_content(article_id: int, full_content: str, image_url: str = None):
+    def make_excerpt(full_content: str):
+        """
+        Liste görünümü için kısa özet. Migration v7 backfill'i ile aynı kural:
+        boşluklar tekilleştirilir, uzun metin son kelime sınırından kesilir.
+        """
+        if not full_content:
+            return None
+
+        body = " ".join(full_content.split())
+        if len(body) <= Config.EXCERPT_LENGTH:
+            return body
+
+        return re.sub(r"\s+\S*$", "", body[:Config.EXCERPT_LENGTH + 1]) + "…"
+
+    @staticmethod
+    def _load_dictionary(dict_id: int) -> bytes:
+        with NewsModel._dictionary_lock:
+            if dict_id in NewsModel._dictionaries:
+                return NewsModel._dictionaries[dict_id]
+
+        with db_cursor() as cur:
+            cur.execute("SELECT dictionary FROM content_dictionaries WHERE id = %s;", (dict_id,))
+            row = cur.fetchone()
+
+        dictionary = bytes(row[0]) if row else None
+        if dictionary:
+            with NewsModel._dictionary_lock:
+                NewsModel._dictionaries[dict_id] = dictionary
+        return dictionary
+
+    @staticmethod
+    def _get_active_dictionary(codec: str):
+        """Codec için en son eğitilmiş sözlük: (id, bytes) veya (0, None)."""
+        with NewsModel._dictionary_lock:
+            cached = NewsModel._active_dictionary.get(codec)
+            if cached and time.monotonic() - cached[0] < 300:
+                return cached[1]
+
+        with db_cursor() as cur:
+            cur.execute("""
+                SELECT id, dictionary FROM content_dictionaries
+                WHERE codec = %s
+                ORDER BY id DESC
+                LIMIT 1;
+            """, (codec,))
+            row = cur.fetchone()
+
+        active = (row[0], bytes(row[1])) if row else (0, None)
+        with NewsModel._dictionary_lock:
+            NewsModel._active_dictionary[codec] = (time.monotonic(), active)
+            if row:
+                NewsModel._dictionaries[row[0]] = active[1]
+        return active
+
+    @staticmethod
+    def encode_content(full_content: str):
+        """
+        Config.CONTENT_COMPRESSION'a göre (full_content, full_content_z) ikilisi.
+        Sıkıştırma kapalıysa metin olduğu gibi full_content'e yazılır.
+        """
+        codec = compression.resolve_codec(Config.CONTENT_COMPRESSION)
+        if codec is None or not full_content:
+            return full_content, None
+
+        dict_id, dictionary = NewsModel._get_active_dictionary(codec)
+        return None, compression.compress(full_content, codec, dict_id, dictionary)
+
+    @staticmethod
+    def decompress_content(blob):
+        try:
+            return compression.decompress(blob, NewsModel._load_dictionary)
+        except PoolExhaustedError:
+            # Sözlük okunamadı: içerik null dönmek yerine 503
+            raise
+        except Exception as e:
+            logger.error(f"❌ İçerik açılamadı: {e}")
+            return None
+
+    @staticmethod
+    def train_content_dictionary():
+        """
+        Son scrape edilmiş haberlerden (Config.CONTENT_DICT_SAMPLES adet) sözlük
+        eğitip content_dictionaries'e yazar. Yeni sözlüğün id'sini döndürür.
+        """
+        codec = compression.resolve_codec(Config.CONTENT_COMPRESSION)
+        if codec is None:
+            return None
+
+        with db_cursor() as cur:
+            cur.execute("""
+                SELECT full_content, full_content_z
+                FROM news
+                WHERE is_scraped
+                ORDER BY saved_at DESC, id DESC
+                LIMIT %s;
+            """, (Config.CONTENT_DICT_SAMPLES,))
+            rows = cur.fetchall()
+
+        samples = [
+            text if text is not None else NewsModel.decompress_content(blob)
+            for text, blob in rows
+        ]
+        samples = [t for t in samples if t]
+
+        if len(samples) < 10:
+            logger.info(f"⏭️  Sözlük için yetersiz örnek ({len(samples)})")
+            return None
+
+        dictionary = compression.train_dictionary(codec, samples, Config.CONTENT_DICT_SIZE)
+        if not dictionary:
+            return None
+
+        with db_cursor(commit=True) as cur:
+            cur.execute("""
+                INSERT INTO content_dictionaries (codec, dictionary, sample_count)
+                VALUES (%s, %s, %s)
+                RETURNING id;
+            """, (codec, dictionary, len(samples)))
+            dict_id = cur.fetchone()[0]
+
+        with NewsModel._dictionary_lock:
+            NewsModel._dictionaries[dict_id] = dictionary
+            NewsModel._active_dictionary.pop(codec, None)
+
+        logger.info(f"📚 {codec} sözlüğü eğitildi: #{dict_id}, {len(dictionary)} byte, {len(samples)} örnek")
+        return dict_id
+
+    @staticmethod
+    def compress_existing(batch_size: int = None, time_budget: float = None) -> dict:
+        """
+        Arka plan migration'ı: düz full_content'i olan kayıtları partiler halinde
+        full_content_z'ye taşır. Her parti ayrı commit edilir; zaman bütçesi
+        dolunca kalan kayıtlar bir sonraki çalıştırmaya kalır.
+        """
+        batch_size = batch_size or Config.CONTENT_COMPRESS_BATCH_SIZE
+        time_budget = time_budget or Config.CONTENT_COMPRESS_TIME_BUDGET
+
+        codec = compression.resolve_codec(Config.CONTENT_COMPRESSION)
+        if codec is None:
+            return {"compressed": 0, "batches": 0, "completed": True, "skipped": True}
+
+        dict_id, dictionary = NewsModel._get_active_dictionary(codec)
+        if dictionary is None and NewsModel.train_content_dictionary():
+            dict_id, dictionary = NewsModel._get_active_dictionary(codec)
+
+        compressed = 0
+        batches = 0
+        completed = False
+        started = time.monotonic()
+
+        while time.monotonic() - started < time_budget:
+            with db_cursor(commit=True) as cur:
+                # Scraper'ın aynı anda güncellediği satırlar atlanır
+                cur.execute("""
+                    SELECT id, full_content
+                    FROM news
+                    WHERE full_content IS NOT NULL AND full_content_z IS NULL
+                    LIMIT %s
+                    FOR UPDATE SKIP LOCKED;
+                """, (batch_size,))
+                rows = cur.fetchall()
+
+                if not rows:
+                    completed = True
+                    break
+
+                values = [
+                    (article_id, compression.compress(text, codec, dict_id, dictionary))
+                    for article_id, text in rows
+                ]
+                execute_values(cur, """
+                    UPDATE news
+                    SET full_content = NULL, full_content_z = v.z
+                    FROM (VALUES %s) AS v (id, z)
+                    WHERE news.id = v.id;
+                """, values, template="(%s, %s::bytea)", page_size=len(values))
+
+            compressed += len(rows)
+            batches += 1
+
+        logger.info(
+            f"🗜️  {compressed} haber sıkıştırıldı ({batches} parti, "
+            f"{'tamamlandı' if completed else 'süre limiti'})"
+        )
+
+        return {
+            "compressed": compressed,
+            "batches": batches,
+            "completed": completed,
+            "dictionary_id": dict_id,
+            "duration_seconds": round(time.monotonic() - started, 2)
+        }
+
+    @staticmethod
+    def is_scraped_content(full_content: str) -> bool:
+        """is_scraped bayrağının tek kaynağı: içerik en az SCRAPED_MIN_LENGTH karakter olmalı."""
+        return bool(full_content) and len(full_content) > NewsModel.SCRAPED_MIN_LENGTH
+
+    @staticmethod
+    def apply_scrape_results(results: list) -> int:
+        """
+        Scrape sonuçlarını (id, content, title, image) tek UPDATE ... FROM (VALUES ...)
+        ve tek commit ile yazar. title/image None ise mevcut değer korunur.
+        Güncellenen satır sayısını döndürür.
+        """
+        if not results:
+            return 0
+
+        saved_at_utc = datetime.now(pytz.UTC)
+        rows = []
+        for r in results:
+            content = r.get("content")
+            plain, blob = NewsModel.encode_content(content)
+            rows.append((
+                r["id"],
+                plain,
+                blob,
+                NewsModel.make_excerpt(content),
+                r.get("title") or None,
+                r.get("image") or None,
+                NewsModel.is_scraped_content(content),
+                saved_at_utc
+            ))
+
         conn = None
         try:
             conn = get_db()
             cur = conn.cursor()
-            
-            saved_at_utc = datetime.now(pytz.UTC)
-            
-            if image_url:
-                cur.execute("""
-                    UPDATE news
-                    SET full_content = %s, image = %s, saved_at = %s
-                    WHERE id = %s;
-                """, (full_content, image_url, saved_at_utc, article_id))
-            else:
-                cur.execute("""
-                    UPDATE news
-                    SET full_content = %s, saved_at = %s
-                    WHERE id = %s;
-                """, (full_content, saved_at_utc, article_id))
-            
+
+            updated_rows = execute_values(cur, """
+                UPDATE news AS n
+                SET full_content = v.full_content,
+                    full_content_z = v.full_content_z,
+                    excerpt = v.excerpt,
+                    title = COALESCE(v.title, n.title),
+                    image = COALESCE(v.image, n.image),
+                    is_scraped = v.is_scraped,
+                    saved_at = v.saved_at
+                FROM (VALUES %s) AS v (id, full_content, full_content_z, excerpt,
+                                       title, image, is_scraped, saved_at)
+                WHERE n.id = v.id
+                RETURNING n.id, n.category;
+            """, rows,
+                template="(%s::integer, %s::text, %s::bytea, %s::text, "
+                         "%s::text, %s::text, %s::boolean, %s::timestamptz)",
+                page_size=len(rows), fetch=True)
+
+            NewsModel._notify_changes(cur, "update", NewsModel._summarize_ids(updated_rows))
+            updated = len(updated_rows)
             conn.commit()
-            
+
+            for r in results:
+                NewsModel._invalidate_detail(r["id"])
+
+            return updated
+
         except Exception as e:
-            logger.error(f"❌ update_full_content hatası: {e}")
+            logger.error(f"❌ apply_scrape_results hatası: {e}")
             if conn:
                 conn.rollback()
+            return 0
         finally:
             if conn:
                 cur.close() if 'cur' in locals() else None
                 put_db(conn)
 
+    @staticmethod
+    def update_full_content(article_id: int, full_content: str, image_url: str = None):
+        NewsModel.apply_scrape_results([
+            {"id": article_id, "content": full_content, "image": image_url}
+        ])
+
     @staticmethod
     def update_title(article_id: int, title: str):
         conn = None
@@ -577,6 +1474,7 @@ class NewsModel:
             """, (title, article_id))
             
             conn.commit()
+            NewsModel._invalidate_detail(article_id)
             
         except Exception as e:
             logger.error(f"❌ update_title hatası: {e}")
@@ -594,7 +1492,7 @@ class NewsModel:
             conn = get_db()
             cur = conn.cursor()
             
-            url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()
+            url_hash = NewsModel._url_hash(url)
             
             cur.execute("""
                 INSERT INTO scraping_blacklist (url_hash, url, fail_count, reason, last_attempt)
@@ -608,12 +1506,23 @@ class NewsModel:
             """, (url_hash, url, reason))
             
             result = cur.fetchone()
+
+            # Eşik tam bu denemede aşıldıysa blacklisted sayısı değişti:
+            # scraped/stats ETag'i commit ile birlikte değişmeli
+            if result and result[0] == NewsModel.BLACKLIST_THRESHOLD:
+                NewsModel._notify_changes(
+                    cur, "blacklist", [(NewsModel.BLACKLIST_KEY, None, None, 1)]
+                )
+
             conn.commit()
             
             if result:
                 fail_count = result[0]
-                if fail_count >= 3:
+                if fail_count >= NewsModel.BLACKLIST_THRESHOLD:
                     logger.warning(f"🚫 {url[:60]}... blacklist'e eklendi ({fail_count} başarısız)")
+                    if NewsModel._blacklist_cache is not None:
+                        NewsModel._blacklist_cache.add(url_hash)
+                return fail_count
             
         except Exception as e:
             logger.error(f"❌ add_to_blacklist hatası: {e}")
@@ -625,13 +1534,46 @@ class NewsModel:
                 put_db(conn)
 
     @staticmethod
-    def is_blacklisted(url: str, threshold: int = 3) -> bool:
+    def load_blacklist() -> set:
+        """
+        Blacklist'teki URL hash'lerini tek sorguda process-local sete yükler.
+        Yüklendikten sonra is_blacklisted() DB'ye gitmez, add_to_blacklist() seti günceller.
+        """
         conn = None
         try:
             conn = get_db()
             cur = conn.cursor()
             
-            url_hash = hashlib.md5(url.encode('utf-8')).hexdigest()
+            cur.execute("""
+                SELECT url_hash FROM scraping_blacklist
+                WHERE fail_count >= %s;
+            """, (NewsModel.BLACKLIST_THRESHOLD,))
+            
+            NewsModel._blacklist_cache = {r[0] for r in cur.fetchall()}
+            logger.debug(f"🚫 Blacklist yüklendi: {len(NewsModel._blacklist_cache)} URL")
+            return NewsModel._blacklist_cache
+            
+        except Exception as e:
+            logger.error(f"❌ load_blacklist hatası: {e}")
+            NewsModel._blacklist_cache = None
+            return set()
+        finally:
+            if conn:
+                cur.close() if 'cur' in locals() else None
+                put_db(conn)
+
+    @staticmethod
+    def is_blacklisted(url: str, threshold: int = 3) -> bool:
+        url_hash = NewsModel._url_hash(url)
+
+        cache = NewsModel._blacklist_cache
+        if cache is not None and threshold == NewsModel.BLACKLIST_THRESHOLD:
+            return url_hash in cache
+
+        conn = None
+        try:
+            conn = get_db()
+            cur = conn.cursor()
             
             cur.execute("""
                 SELECT fail_count FROM scraping_blacklist
@@ -652,18 +1594,154 @@ class NewsModel:
                 cur.close() if 'cur' in locals() else None
                 put_db(conn)
 
+    @staticmethod
+    def _empty_stats() -> dict:
+        return {
+            "by_category": {
+                c: {"total": 0, "scraped": 0, "unscraped": 0}
+                for c in Config.NEWS_CATEGORIES
+            },
+            "total": 0,
+            "scraped": 0,
+            "unscraped": 0,
+            "blacklisted": 0
+        }
+
+    # news_counters saklanan tüm satırları sayar; süresi dolup cleanup'ı
+    # bekleyen satırlar (idx_news_expires_at'te küçük bir aralık) düşülür.
+    # Sonuç list sorgularının expires_at > NOW() filtresiyle aynı kümeyi sayar.
+    LIVE_COUNTS_SQL = """
+        SELECT c.category, c.is_scraped, c.n - COALESCE(e.n, 0) AS n
+        FROM news_counters c
+        LEFT JOIN (
+            SELECT category, is_scraped, COUNT(*) AS n
+            FROM news
+            WHERE expires_at <= NOW()
+            GROUP BY category, is_scraped
+        ) e USING (category, is_scraped)
+    """
+
+    @staticmethod
+    def get_stats(use_cache: bool = True) -> dict:
+        """
+        Kategori bazlı toplam/scraped/unscraped sayıları, genel toplamlar ve
+        blacklist sayısını döndürür. Haber sayıları trigger'larla tutulan
+        news_counters'tan okunur, süresi dolmuş satırlar düşülür (bkz.
+        LIVE_COUNTS_SQL). Sonuç Config.STATS_CACHE_TTL saniye
+        boyunca process içinde tutulur. DB hatası çağırana iletilir.
+        """
+        if use_cache:
+            with NewsModel._stats_lock:
+                cached = NewsModel._stats_cache
+                if cached and time.monotonic() - NewsModel._stats_cache_at < Config.STATS_CACHE_TTL:
+                    return cached
+
+        try:
+            with db_cursor(read_only=True) as cur:
+                cur.execute(f"{NewsModel.LIVE_COUNTS_SQL};")
+                rows = cur.fetchall()
+
+                cur.execute(
+                    "SELECT COUNT(*) FROM scraping_blacklist WHERE fail_count >= %s;",
+                    (NewsModel.BLACKLIST_THRESHOLD,)
+                )
+                blacklisted = cur.fetchone()[0]
+
+            stats = NewsModel._empty_stats()
+            stats["blacklisted"] = blacklisted
+
+            for category, is_scraped, n in rows:
+                n = max(n, 0)
+                bucket = stats["by_category"].setdefault(
+                    category, {"total": 0, "scraped": 0, "unscraped": 0}
+                )
+                key = "scraped" if is_scraped else "unscraped"
+                bucket[key] += n
+                bucket["total"] += n
+                stats[key] += n
+                stats["total"] += n
+
+            with NewsModel._stats_lock:
+                NewsModel._stats_cache = stats
+                NewsModel._stats_cache_at = time.monotonic()
+
+            return stats
+
+        except PoolExhaustedError:
+            raise
+        except Exception:
+            # Sıfır sayılarla 200 dönmek kesintiyi gizler; route'lar 500 döndürür
+            logger.exception(f"❌ get_stats hatası")
+            raise
+
+    @staticmethod
+    def invalidate_stats():
+        with NewsModel._stats_lock:
+            NewsModel._stats_cache = None
+
+    @staticmethod
+    def reconcile_counters() -> dict:
+        """
+        news_counters'ı gerçek COUNT(*) ile eşitler (partition DROP gibi trigger
+        tetiklemeyen silmelerden sonra). Sayım sırasında counter'a yazmak
+        isteyen işlemler EXCLUSIVE lock'ta bekler, delta kaybolmaz.
+        Düzeltilen toplam farkı döndürür.
+        """
+        try:
+            with db_cursor(commit=True) as cur:
+                cur.execute("LOCK TABLE news_counters IN EXCLUSIVE MODE;")
+                cur.execute("""
+                    SELECT category, is_scraped, COUNT(*)
+                    FROM news
+                    GROUP BY category, is_scraped;
+                """)
+                actual = {(c, sc): n for c, sc, n in cur.fetchall()}
+
+                cur.execute("SELECT category, is_scraped, n FROM news_counters;")
+                stored = {(c, sc): n for c, sc, n in cur.fetchall()}
+
+                drift = sum(
+                    abs(actual.get(key, 0) - stored.get(key, 0))
+                    for key in set(actual) | set(stored)
+                )
+
+                if drift:
+                    cur.execute("DELETE FROM news_counters;")
+                    if actual:
+                        execute_values(
+                            cur,
+                            "INSERT INTO news_counters (category, is_scraped, n) VALUES %s",
+                            [(c, sc, n) for (c, sc), n in actual.items()]
+                        )
+
+            if drift:
+                logger.info(f"🔢 news_counters düzeltildi (fark: {drift})")
+                with NewsModel._stats_lock:
+                    NewsModel._stats_cache = None
+
+            return {"drift": drift, "total": sum(actual.values())}
+
+        except Exception as e:
+            logger.error(f"❌ reconcile_counters hatası: {e}")
+            return {"drift": 0, "error": str(e)}
+
     @staticmethod
     def get_blacklist_count() -> int:
         conn = None
         try:
-            conn = get_db()
+            conn = get_db(read_only=True)
             cur = conn.cursor()
             
-            cur.execute("SELECT COUNT(*) FROM scraping_blacklist WHERE fail_count >= 3;")
+            cur.execute(
+                "SELECT COUNT(*) FROM scraping_blacklist WHERE fail_count >= %s;",
+                (NewsModel.BLACKLIST_THRESHOLD,)
+            )
             result = cur.fetchone()
             
             return result[0] if result else 0
             
+        except PoolExhaustedError:
+            raise
         except Exception as e:
             logger.error(f"❌ get_blacklist_count hatası: {e}")
             return 0
@@ -673,52 +1751,52 @@ class NewsModel:
                 put_db(conn)
 
     @staticmethod
-    def count_by_category(category: str):
+    def _sum_counters(condition: str = "TRUE", params: tuple = (), read_only: bool = True) -> int:
+        """Süresi dolmamış haber sayısı, news_counters üzerinden (bkz. LIVE_COUNTS_SQL)."""
         conn = None
         try:
-            conn = get_db()
+            conn = get_db(read_only=read_only)
             cur = conn.cursor()
             
-            cur.execute("""
-                SELECT COUNT(*) FROM news
-                WHERE category = %s AND expires_at > NOW();
-            """, (category,))
+            cur.execute(
+                f"SELECT COALESCE(SUM(n), 0) FROM ({NewsModel.LIVE_COUNTS_SQL}) AS live WHERE {condition};",
+                params
+            )
             
             result = cur.fetchone()
-            return result[0] if result else 0
+            return max(int(result[0]), 0) if result else 0
             
-        except Exception as e:
-            logger.exception(f"❌ count_by_category hatası")
-            return 0
         finally:
             if conn:
                 cur.close() if 'cur' in locals() else None
                 put_db(conn)
 
+    @staticmethod
+    def count_by_category(category: str):
+        try:
+            return NewsModel._sum_counters("category = %s", (category,))
+        except PoolExhaustedError:
+            raise
+        except Exception as e:
+            logger.exception(f"❌ count_by_category hatası")
+            return 0
+
     @staticmethod
     def get_total_count():
-        conn = None
         try:
-            conn = get_db()
-            cur = conn.cursor()
-            
-            cur.execute("SELECT COUNT(*) FROM news WHERE expires_at > NOW();")
-            result = cur.fetchone()
-            return result[0] if result else 0
-            
+            return NewsModel._sum_counters()
+        except PoolExhaustedError:
+            raise
         except Exception as e:
             logger.exception(f"❌ get_total_count hatası")
             return 0
-        finally:
-            if conn:
-                cur.close() if 'cur' in locals() else None
-                put_db(conn)
 
     @staticmethod
     def get_latest_update_time():
         conn = None
         try:
-            conn = get_db()
+            # Tazelik hassas: replica çok gerideyse primary'den okunur
+            conn = get_db(read_only=True, max_staleness=Config.DB_READ_MAX_LAG_SECONDS)
             cur = conn.cursor()
             
             cur.execute("SELECT MAX(saved_at) FROM news;")
@@ -728,6 +1806,8 @@ class NewsModel:
                 return result[0]
             return None
             
+        except PoolExhaustedError:
+            raise
         except Exception as e:
             logger.exception(f"❌ get_latest_update_time hatası")
             return None
@@ -737,46 +1817,26 @@ class NewsModel:
                 put_db(conn)
 
     @staticmethod
-    def count_scraped():
-        conn = None
+    def scraped_total(category: str = None) -> int:
+        """/scraped total_scraped değeri: kategoriye göre, get_stats cache'inden."""
+        stats = NewsModel.get_stats()
+        if category:
+            return stats["by_category"].get(category, {}).get("scraped", 0)
+        return stats["scraped"]
+
+    @staticmethod
+    def count_scraped(category: str = None):
         try:
-            conn = get_db()
-            cur = conn.cursor()
-            
-            cur.execute("""
-                SELECT COUNT(*) FROM news
-                WHERE full_content IS NOT NULL 
-                  AND LENGTH(full_content) > 100
-                  AND expires_at > NOW();
-            """)
-            
-            result = cur.fetchone()
-            return result[0] if result else 0
-            
+            if category:
+                return NewsModel._sum_counters("is_scraped AND category = %s", (category,))
+            return NewsModel._sum_counters("is_scraped")
+        except PoolExhaustedError:
+            raise
         except Exception as e:
             logger.exception(f"❌ count_scraped hatası")
             return 0
-        finally:
-            if conn:
-                cur.close() if 'cur' in locals() else None
-                put_db(conn)
 
     @staticmethod
     def count_unscraped():
-        conn = None
-        try:
-            conn = get_db()
-            cur = conn.cursor()
-            
-            cur.execute("""
-                SELECT COUNT(*) FROM news
-                WHERE (full_content IS NULL OR LENGTH(full_content) < 100)
-                  AND expires_at > NOW();
-            """)
-            
-            result = cur.fetchone()
-            return result[0] if result else 0
-        finally:
-            if conn:
-                cur.close() if 'cur' in locals() else None
-                put_db(conn)
+        # Scheduler kararı için primary'den okunur
+        return NewsModel._sum_counters("NOT is_scraped", read_only=False)
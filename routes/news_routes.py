@@ -1,10 +1,14 @@
 from flask import Blueprint, jsonify, request
 from models.news_models import NewsModel
+from models.db import PoolExhaustedError, get_pool_status
 from services.news_service import NewsService
+from services import change_feed
+from services.http_cache import cached_response, conditional_response, get_cache_stats
 from services.news_scraper import scrape_latest_news  # ✅ YENİ: İçerik doldurucu eklendi
 from datetime import datetime
 import pytz
 from config import Config
+from utils.json_render import json_response, sql_render_enabled
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,33 +17,55 @@ news_bp = Blueprint("news", __name__, url_prefix="/api/news")
 
 
 @news_bp.route("/scraped", methods=["GET"])
+@cached_response
 def get_scraped_news():
     try:
         limit = request.args.get('limit', 50, type=int)
         offset = request.args.get('offset', 0, type=int)
         category = request.args.get('category', None, type=str)
+        cursor = request.args.get('cursor', None, type=str)
+        view = request.args.get('view', 'full', type=str)
         
         if limit > 200:
             limit = 200
         
-        news = NewsModel.get_scraped_only(
+        page = NewsModel.get_scraped_page(
             category=category,
             limit=limit,
-            offset=offset
+            offset=offset,
+            cursor=cursor,
+            view=view,
+            sql_render=sql_render_enabled()
         )
         
-        total_scraped = NewsModel.count_scraped()
+        total_scraped = NewsModel.scraped_total(category)
+        next_cursor = page["next_cursor"]
         
-        logger.info(f"📱 Android request: {len(news)} scrape edilmiş haber döndürüldü")
+        # Offset'te kategori toplamı kesin sonucu verir; cursor'da toplam
+        # cursor'ın konumunu bilmez, dolu sayfa devam var demektir
+        if cursor:
+            has_more = next_cursor is not None
+        else:
+            has_more = offset + page["count"] < total_scraped
         
-        return jsonify({
+        logger.info(f"📱 Android request: {page['count']} scrape edilmiş haber döndürüldü")
+        
+        return json_response({
             "success": True,
-            "count": len(news),
+            "count": page["count"],
             "total_scraped": total_scraped,
-            "has_more": (offset + len(news)) < total_scraped,
-            "news": news
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+            "news": page["news"]
         })
         
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except PoolExhaustedError:
+        raise
     except Exception as e:
         logger.exception("❌ /scraped endpoint hatası")
         return jsonify({
@@ -49,11 +75,13 @@ def get_scraped_news():
 
 
 @news_bp.route("/scraped/after", methods=["GET"])
+@cached_response
 def get_scraped_after():
     try:
         after = request.args.get('after', type=str)
         limit = request.args.get('limit', 50, type=int)
         category = request.args.get('category', None, type=str)
+        view = request.args.get('view', 'full', type=str)
         
         if not after:
             return jsonify({
@@ -64,19 +92,21 @@ def get_scraped_after():
         if limit > 200:
             limit = 200
         
-        news = NewsModel.get_scraped_after(
+        page = NewsModel.get_scraped_after_page(
             after_date=after,
             category=category,
-            limit=limit
+            limit=limit,
+            view=view,
+            sql_render=sql_render_enabled()
         )
         
-        logger.info(f"📱 Worker request: {after} sonrası {len(news)} yeni haber")
+        logger.info(f"📱 Worker request: {after} sonrası {page['count']} yeni haber")
         
-        return jsonify({
+        return json_response({
             "success": True,
-            "count": len(news),
+            "count": page["count"],
             "after": after,
-            "news": news
+            "news": page["news"]
         })
         
     except ValueError as e:
@@ -84,6 +114,8 @@ def get_scraped_after():
             "success": False,
             "error": f"Invalid date format: {str(e)}"
         }), 400
+    except PoolExhaustedError:
+        raise
     except Exception as e:
         logger.exception("❌ /scraped/after endpoint hatası")
         return jsonify({
@@ -92,13 +124,88 @@ def get_scraped_after():
         }), 500
 
 
+@news_bp.route("/search", methods=["GET"])
+def search_news():
+    try:
+        q = (request.args.get('q', '', type=str) or '').strip()
+        category = request.args.get('category', None, type=str)
+        cursor = request.args.get('cursor', None, type=str)
+        limit = request.args.get('limit', 20, type=int)
+        
+        if not q:
+            return jsonify({
+                "success": False,
+                "error": "Missing required parameter: 'q'"
+            }), 400
+        
+        limit = max(1, min(limit, Config.MAX_NEWS_PER_PAGE))
+        
+        results, next_cursor = NewsModel.search(
+            q,
+            category=category,
+            limit=limit,
+            cursor=cursor
+        )
+        
+        return jsonify({
+            "success": True,
+            "query": q,
+            "count": len(results),
+            "next_cursor": next_cursor,
+            "news": results
+        })
+        
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except PoolExhaustedError:
+        raise
+    except Exception as e:
+        logger.exception("❌ /search endpoint hatası")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
+@news_bp.route("/<int:article_id>", methods=["GET"])
+def get_article(article_id):
+    """Liste görünümündeki (view=list) haberin full_content dahil detayı."""
+    try:
+        article = NewsModel.get_by_id(article_id)
+        
+        if not article:
+            return jsonify({
+                "success": False,
+                "error": "not_found"
+            }), 404
+        
+        return jsonify({
+            "success": True,
+            "news": article
+        })
+        
+    except PoolExhaustedError:
+        raise
+    except Exception as e:
+        logger.exception(f"❌ /{article_id} endpoint hatası")
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 500
+
+
 @news_bp.route("/scraped/stats", methods=["GET"])
+@conditional_response
 def scraped_stats():
     try:
-        scraped = NewsModel.count_scraped()
-        unscraped = NewsModel.count_unscraped()
-        blacklisted = NewsModel.get_blacklist_count()
-        total = NewsModel.get_total_count()
+        stats = NewsModel.get_stats()
+        scraped = stats["scraped"]
+        unscraped = stats["unscraped"]
+        blacklisted = stats["blacklisted"]
+        total = stats["total"]
         
         return jsonify({
             "success": True,
@@ -109,6 +216,8 @@ def scraped_stats():
             "scraping_rate": round((scraped / total * 100) if total > 0 else 0, 1)
         })
         
+    except PoolExhaustedError:
+        raise
     except Exception as e:
         logger.exception("❌ /scraped/stats hatası")
         return jsonify({
@@ -118,18 +227,35 @@ def scraped_stats():
 
 
 @news_bp.route("/latest", methods=["GET"])
+@cached_response
 def latest_news():
     try:
         limit = request.args.get('limit', 100, type=int)
         offset = request.args.get('offset', 0, type=int)
+        cursor = request.args.get('cursor', None, type=str)
+        view = request.args.get('view', 'full', type=str)
         
-        news = NewsModel.get_news(limit=limit, offset=offset)
+        page = NewsModel.get_news_page(
+            limit=limit,
+            offset=offset,
+            cursor=cursor,
+            view=view,
+            sql_render=sql_render_enabled()
+        )
         
-        return jsonify({
+        return json_response({
             "success": True,
-            "count": len(news),
-            "news": news
+            "count": page["count"],
+            "next_cursor": page["next_cursor"],
+            "news": page["news"]
         })
+    except ValueError as e:
+        return jsonify({
+            "success": False,
+            "error": str(e)
+        }), 400
+    except PoolExhaustedError:
+        raise
     except Exception as e:
         logger.exception("❌ /latest endpoint hatası")
         return jsonify({
@@ -160,6 +286,8 @@ def last_update():
             "has_data": True
         })
         
+    except PoolExhaustedError:
+        raise
     except Exception as e:
         logger.exception("❌ /last-update hatası")
         return jsonify({
@@ -200,14 +328,20 @@ def system_status():
         if isinstance(db_last, datetime):
             status["database"]["latest_update"] = db_last.isoformat()
         
+        stats = NewsModel.get_stats()
         status["scraping"] = {
-            "scraped": NewsModel.count_scraped(),
-            "unscraped": NewsModel.count_unscraped(),
-            "blacklisted": NewsModel.get_blacklist_count()
+            "scraped": stats["scraped"],
+            "unscraped": stats["unscraped"],
+            "blacklisted": stats["blacklisted"]
         }
+        status["db_pool"] = get_pool_status()
+        status["change_feed"] = change_feed.status()
+        status["response_cache"] = get_cache_stats()
         
         return jsonify(status)
         
+    except PoolExhaustedError:
+        raise
     except Exception as e:
         logger.exception("❌ /status hatası")
         return jsonify({
@@ -235,6 +369,8 @@ def get_blacklist():
             "message": f"{count} URL blacklist'te"
         })
         
+    except PoolExhaustedError:
+        raise
     except Exception as e:
         logger.exception("❌ /blacklist hatası")
         return jsonify({
@@ -257,6 +393,8 @@ def get_unscraped():
             "articles": articles
         })
         
+    except PoolExhaustedError:
+        raise
     except Exception as e:
         logger.exception("❌ /unscraped hatası")
         return jsonify({
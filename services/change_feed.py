@@ -0,0 +1,223 @@
+"""
+news_changed LISTEN/NOTIFY akışı.
+
+NewsModel'in yazma yolları (save_bulk, scrape write-back, delete_expired,
+partition drop) aynı transaction'da news_generations'taki kategori sıra
+numarasını artırır ve commit ile birlikte NOTIFY gönderir. Her worker
+process'te bir listener thread payload'daki sıra numaralarını uygular;
+response cache ve ETag'ler bu değerlere göre anahtarlanır. Değerler DB'den
+geldiği için tüm worker'larda ve yeniden başlatmalardan sonra aynıdır.
+Listener bağlı değilse tablo CHANGE_FEED_POLL_SECONDS aralıklarla okunur.
+"""
+import psycopg2
+import psycopg2.extensions
+from models.news_models import NewsModel
+from models.db import PoolExhaustedError
+from config import Config
+from datetime import datetime
+import json
+import logging
+import os
+import select
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+ALL = NewsModel.ALL_CATEGORIES_KEY
+
+_lock = threading.Lock()
+_listener_pid = None
+_listener_thread = None
+_connected = False
+
+# category ('*' dahil) → (seq, changed_at); news_generations'ın process içi kopyası
+_generations = {}
+_synced_at = 0.0
+_events = 0
+_last_event_at = None
+
+
+def _apply(key: str, seq: int, changed_at: datetime) -> bool:
+    with _lock:
+        current = _generations.get(key)
+        if current is not None and current[0] >= seq:
+            return False
+        _generations[key] = (seq, changed_at)
+        return True
+
+
+def sync_from_db():
+    """news_generations'ı okuyup yerel kopyayı günceller."""
+    global _synced_at
+
+    changed = False
+    for key, (seq, changed_at) in NewsModel.get_generations().items():
+        changed = _apply(key, seq, changed_at) or changed
+
+    _synced_at = time.monotonic()
+
+    # Kaçırılan değişiklikler olabilir: sayılar da taze okunmalı
+    if changed:
+        NewsModel.invalidate_stats()
+
+
+def _ensure_fresh():
+    global _synced_at
+
+    if is_live() or time.monotonic() - _synced_at < Config.CHANGE_FEED_POLL_SECONDS:
+        return
+
+    try:
+        sync_from_db()
+    except PoolExhaustedError:
+        raise
+    except Exception as e:
+        # Her istekte tekrar denenmesin; bir sonraki poll aralığında yeniden
+        _synced_at = time.monotonic()
+        logger.warning(f"⚠️  news_generations okunamadı: {e}")
+
+
+def generation(category: str = None) -> str:
+    """
+    Cache/ETag anahtarı. category verilirse sadece o kategori (ve tüm
+    kategorileri etkileyen olaylar) değiştiğinde değişir.
+    """
+    _ensure_fresh()
+
+    with _lock:
+        if category is None:
+            return str(max((seq for seq, _ in _generations.values()), default=0))
+        wildcard = _generations.get(ALL, (0, None))[0]
+        return f"{wildcard}.{_generations.get(category, (0, None))[0]}"
+
+
+def last_modified(category: str = None):
+    """İlgili kategorilerdeki son değişiklik zamanı (news_generations.changed_at) veya None."""
+    _ensure_fresh()
+
+    with _lock:
+        if category is None:
+            times = [changed_at for _, changed_at in _generations.values()]
+        else:
+            times = [
+                _generations[key][1] for key in (ALL, category) if key in _generations
+            ]
+
+    return max(times) if times else None
+
+
+def handle_payload(payload: str):
+    global _events, _last_event_at
+
+    with _lock:
+        _events += 1
+        _last_event_at = time.time()
+
+    try:
+        event = json.loads(payload)
+        seq = int(event["seq"])
+        changed_at = datetime.fromisoformat(event["changed_at"])
+    except (TypeError, ValueError, KeyError):
+        logger.warning(f"⚠️  Geçersiz news_changed payload: {payload!r}")
+        sync_from_db()
+        return
+
+    # Yeni generation görüldüğünde sayılar da taze okunmalı (ETag ile uyumlu)
+    NewsModel.invalidate_stats()
+    _apply(event.get("category") or ALL, seq, changed_at)
+
+    if event.get("op") in ("update", "delete", "drop"):
+        NewsModel.invalidate_detail_range(event.get("min_id"), event.get("max_id"))
+
+
+def _listen_forever():
+    global _connected
+
+    backoff = 1
+    while True:
+        conn = None
+        try:
+            # NOTIFY replica'ya iletilmez, primary dinlenir
+            conn = psycopg2.connect(Config.DB_URL, connect_timeout=10)
+            conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+            with conn.cursor() as cur:
+                cur.execute(f"LISTEN {NewsModel.CHANGE_CHANNEL};")
+
+            # LISTEN'dan önce commit edilen değişiklikler tablodan alınır;
+            # arada gelen bildirimler seq karşılaştırmasıyla tekilleşir
+            sync_from_db()
+            _connected = True
+            backoff = 1
+            logger.info(f"📡 Change feed dinleniyor (pid {os.getpid()})")
+
+            while True:
+                if select.select([conn], [], [], Config.CHANGE_FEED_POLL_SECONDS) == ([], [], []):
+                    continue
+
+                conn.poll()
+                while conn.notifies:
+                    notify = conn.notifies.pop(0)
+                    handle_payload(notify.payload)
+
+        except Exception as e:
+            _connected = False
+            logger.warning(f"⚠️  Change feed bağlantısı koptu, {backoff}s sonra tekrar: {e}")
+            time.sleep(backoff)
+            backoff = min(backoff * 2, 60)
+        finally:
+            if conn is not None:
+                try:
+                    conn.close()
+                except Exception:
+                    pass
+
+
+def ensure_listener():
+    """
+    Bu process'te listener thread yoksa başlatır. gunicorn fork sonrası her
+    worker kendi thread'ini açar (pid kontrolü); before_request'ten çağrılır.
+    """
+    global _listener_pid, _listener_thread, _connected
+
+    if not Config.CHANGE_FEED_ENABLED:
+        return
+
+    pid = os.getpid()
+    if _listener_pid == pid:
+        return
+
+    with _lock:
+        if _listener_pid == pid:
+            return
+
+        # Fork ile gelen bağlantı durumu bu process için geçersiz; generation
+        # değerleri DB'den geldiği için korunabilir
+        _connected = False
+        _listener_pid = pid
+
+    _listener_thread = threading.Thread(
+        target=_listen_forever,
+        name="news-change-feed",
+        daemon=True
+    )
+    _listener_thread.start()
+
+
+def is_live() -> bool:
+    """Listener bağlı mı? Değilse generation değerleri tablodan poll edilir."""
+    return Config.CHANGE_FEED_ENABLED and _connected and _listener_pid == os.getpid()
+
+
+def status() -> dict:
+    current = generation()
+    with _lock:
+        return {
+            "enabled": Config.CHANGE_FEED_ENABLED,
+            "connected": is_live(),
+            "pid": _listener_pid,
+            "events": _events,
+            "last_event_at": _last_event_at,
+            "generation": current,
+            "by_category": {key: seq for key, (seq, _) in _generations.items()}
+        }
@@ -3,6 +3,7 @@ from datetime import datetime
 from typing import List, Dict, Optional
 import logging
 from config import Config
+from utils.helpers import canonicalize_url
 
 logger = logging.getLogger(__name__)
 
@@ -39,25 +40,18 @@ def urls_similar(u1: str, u2: str) -> bool:
     if not u1 or not u2:
         return False
 
-    def clean(url: str) -> str:
-        url = (
-            url.lower()
-            .replace("https://", "")
-            .replace("http://", "")
-            .replace("www.", "")
-            .split("?")[0]
-            .split("#")[0]
-            .rstrip("/")
-        )
-        return url
-
-    u1c = clean(u1)
-    u2c = clean(u2)
+    # Benzerlik sezgisi büyük/küçük harfe duyarsız; canonical_url kolonu değil
+    try:
+        u1c = canonicalize_url(u1).lower()
+        u2c = canonicalize_url(u2).lower()
+    except ValueError:
+        # Çözümlenemeyen URL (bozuk host) hiçbir şeye benzemez
+        return False
 
     if u1c == u2c:
         return True
 
-    # m.example.com/news/123 ≈ example.com/news/123
+    # Farklı alt alan adı, aynı yol: news.example.com/123 ≈ example.com/123
     def get_path(url: str) -> str:
         parts = url.split("/", 1)
         return parts[1] if len(parts) > 1 else ""
@@ -140,24 +134,23 @@ def remove_duplicates(news_list: List[Dict]) -> List[Dict]:
 # -----------------------------------------------------------
 # 5) Mevcut Haberlerle Karşılaştırma (DB Kontrolü)
 # -----------------------------------------------------------
-def filter_against_existing(new_articles: List[Dict], existing_articles: List[Dict]) -> List[Dict]:
-    if not existing_articles:
-        return new_articles
+def filter_against_existing(new_articles: List[Dict]) -> List[Dict]:
+    """
+    Son Config.DUPLICATE_WINDOW_HOURS saatteki kayıtlarla başlığı
+    SIMILARITY_THRESHOLD üstünde benzeyen (pg_trgm) veya URL'si aynı olanları eler.
+    Kontrol DB tarafında, batch başına tek sorguyla yapılır.
+    """
+    if not new_articles:
+        return []
 
-    result = []
-    for new in new_articles:
-        is_dup = False
+    from models.news_models import NewsModel
 
-        for old in existing_articles:
-            if titles_similar(new.get("title", ""), old.get("title", "")):
-                is_dup = True
-                break
-            if urls_similar(new.get("url", ""), old.get("url", "")):
-                is_dup = True
-                break
+    duplicates = NewsModel.find_near_duplicates(new_articles, threshold=SIMILARITY_THRESHOLD)
+    result = [a for i, a in enumerate(new_articles) if i not in duplicates]
 
-        if not is_dup:
-            result.append(new)
+    if duplicates:
+        logger.info(f"🧹 DB benzerlik kontrolü: {len(new_articles)} → {len(result)} "
+                    f"({len(duplicates)} yakın duplicate)")
 
     return result
 
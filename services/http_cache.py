@@ -0,0 +1,367 @@
+"""
+Feed endpoint'leri için process-local, sınırlı (LRU) response cache ve
+conditional GET (ETag / Last-Modified / 304).
+
+Anahtar: route + query parametreleri + kategori generation'ı (news_generations,
+bkz. change_feed) + SystemModel.last_update + sıradaki expires_at sınırı.
+Hepsi DB'de paylaşılan durum olduğu için aynı veri her worker'da aynı ETag'i
+üretir. Veri değiştiğinde ya da bir haberin süresi dolduğunda anahtar değişir;
+eski kayıtlar bir daha okunmaz ve LRU ile düşer, TTL sadece üst sınırdır.
+ETag aynı anahtarın hash'idir, bu yüzden 304 kararı liste sorgusu
+çalışmadan verilir. Cache kayıtları sıkıştırılmış varyantları da tutar.
+"""
+from flask import current_app, g, make_response, request
+from werkzeug.http import http_date, parse_date, parse_etags, quote_etag
+from functools import wraps
+from collections import OrderedDict
+from datetime import datetime, timezone
+from models.system_models import SystemModel
+from models.news_models import NewsModel
+from models.db import read_staleness
+from services import change_feed
+from utils import http_compression
+from config import Config
+import hashlib
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    __slots__ = ("body", "mimetype", "headers", "stored_at", "variants")
+
+    def __init__(self, body: bytes, mimetype: str, headers: dict):
+        self.body = body
+        self.mimetype = mimetype
+        self.headers = headers
+        self.stored_at = time.monotonic()
+        self.variants = {}
+
+    def variant(self, encoding: str) -> bytes:
+        # Her encoding kayıt başına bir kez sıkıştırılır; eşzamanlı iki istek
+        # aynı sonucu üretir, fazladan kilide gerek yok
+        body = self.variants.get(encoding)
+        if body is None:
+            body = http_compression.compress_body(self.body, encoding)
+            self.variants[encoding] = body
+        return body
+
+
+class ResponseCache:
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "not_modified": 0}
+
+    def get(self, key, ttl: float):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            if time.monotonic() - entry.stored_at >= ttl:
+                del self._entries[key]
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry
+
+    def put(self, key, entry: CachedResponse):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def count(self, name: str):
+        with self._lock:
+            self._stats[name] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hit_rate": round(self._stats["hits"] / lookups * 100, 1) if lookups else 0.0
+            }
+
+
+_cache = ResponseCache(Config.RESPONSE_CACHE_MAX_ENTRIES)
+
+# SystemModel.last_update her istekte değil, kısa aralıklarla okunur
+_last_update = {"value": None, "checked_at": 0.0}
+_last_update_lock = threading.Lock()
+
+
+def last_update_time():
+    """SystemModel.last_update (UTC, tz-aware) veya None."""
+    with _last_update_lock:
+        if time.monotonic() - _last_update["checked_at"] < Config.LAST_UPDATE_CHECK_TTL:
+            return _last_update["value"]
+
+    ts = SystemModel.get_last_update()
+    # system_info.last_update TIMESTAMP (tz'siz) kolonunda UTC tutulur
+    if ts is not None and ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+
+    with _last_update_lock:
+        _last_update["value"] = ts
+        _last_update["checked_at"] = time.monotonic()
+
+    return ts
+
+
+# (son geçilen, sıradaki) expires_at: sıradaki sınır gelene kadar ikisi de
+# değişmez (yeni haberler daha geç dolar)
+_expiry = {"value": (None, None), "checked_at": 0.0}
+_expiry_lock = threading.Lock()
+
+
+def expiry_bounds():
+    """(son geçilen, sıradaki) expires_at sınırı (UTC); sıradaki geçilince yeniden okunur."""
+    now = datetime.now(timezone.utc)
+
+    with _expiry_lock:
+        passed, upcoming = _expiry["value"]
+        if upcoming is not None and now < upcoming:
+            return passed, upcoming
+        if upcoming is None and time.monotonic() - _expiry["checked_at"] < Config.LAST_UPDATE_CHECK_TTL:
+            return passed, upcoming
+
+    value = NewsModel.expiry_bounds()
+
+    with _expiry_lock:
+        _expiry["value"] = value
+        _expiry["checked_at"] = time.monotonic()
+
+    return value
+
+
+def cache_ttl() -> float:
+    return Config.CACHE_DURATION
+
+
+def cache_key(path: str, args_items, category: str = None) -> tuple:
+    last_update = last_update_time()
+    _, expiry = expiry_bounds()
+
+    # Süresi dolan haber bildirim üretmez; sınır geçilince anahtar değişir
+    return (
+        path,
+        tuple(sorted(args_items)),
+        change_feed.generation(category or None),
+        last_update.isoformat() if last_update else "",
+        expiry.isoformat() if expiry else "",
+    )
+
+
+def last_modified(category: str = None):
+    """
+    max(SystemModel.last_update, news_generations.changed_at, son geçilen
+    expires_at) veya None. Sınır geçildiğinde ETag ile birlikte Last-Modified
+    de ilerler; yalnız If-Modified-Since gönderen istemci süresi dolan haberleri
+    304 ile tutmaya devam etmez.
+    """
+    passed, _ = expiry_bounds()
+    times = [
+        t for t in (change_feed.last_modified(category or None), last_update_time(), passed)
+        if t
+    ]
+    return max(times) if times else None
+
+
+def read_staleness_for(modified):
+    """
+    Anahtardaki son değişikliği görmüş olması gereken okumalar için replica
+    tazelik şartı: replica değişiklikten bu yana geçen süreden az gerideyse
+    okunabilir. Gecikme ölçümü DB_READ_LAG_CHECK_INTERVAL kadar eski
+    olabildiği için o kadar pay bırakılır; sonuç negatifse primary okunur.
+    """
+    if modified is None:
+        return None
+
+    age = (datetime.now(timezone.utc) - modified).total_seconds()
+    return age - Config.DB_READ_LAG_CHECK_INTERVAL
+
+
+def validators(path: str, args_items, category: str = None):
+    """(cache anahtarı, ETag, Last-Modified, yanıt header'ları, okuma tazelik şartı)"""
+    key = cache_key(path, args_items, category)
+    etag = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:32]
+    modified = last_modified(category)
+
+    headers = {
+        "ETag": quote_etag(etag),
+        "Cache-Control": "no-cache",
+        "Vary": "Accept-Encoding"
+    }
+    if modified is not None:
+        headers["Last-Modified"] = http_date(modified)
+
+    return key, etag, modified, headers, read_staleness_for(modified)
+
+
+def is_not_modified(etag: str, modified, if_none_match: str = None,
+                    if_modified_since: str = None):
+    """
+    İstemcinin kopyası güncelse 304'te gönderilecek ETag'i (tırnaksız),
+    değilse None döndürür. Sıkıştırılmış varyant ETag'leri de eşleşir.
+    """
+    # If-None-Match varsa If-Modified-Since dikkate alınmaz (RFC 9110)
+    if if_none_match:
+        client_etags = parse_etags(if_none_match)
+        candidates = [etag] + [
+            http_compression.encoded_etag(etag, enc) for enc in http_compression.ENCODINGS
+        ]
+        for candidate in candidates:
+            if client_etags.contains_weak(candidate):
+                return candidate
+        return None
+
+    if if_modified_since and modified is not None:
+        since = parse_date(if_modified_since)
+        if since is not None and modified.replace(microsecond=0) <= since:
+            return etag
+
+    return None
+
+
+def record_not_modified():
+    _cache.count("not_modified")
+
+
+def cache_enabled(debug: bool) -> bool:
+    return Config.RESPONSE_CACHE_ENABLED and not debug
+
+
+def cache_get(key):
+    return _cache.get(key, cache_ttl())
+
+
+def cache_put(key, body: bytes, mimetype: str) -> CachedResponse:
+    entry = CachedResponse(body=body, mimetype=mimetype, headers={})
+    _cache.put(key, entry)
+    return entry
+
+
+def _serve(view, args, kwargs, use_cache: bool):
+    category = request.args.get("category")
+    key, etag, modified, headers, staleness = validators(
+        request.path, request.args.items(multi=True), category
+    )
+
+    matched = is_not_modified(etag, modified,
+                              request.headers.get("If-None-Match"),
+                              request.headers.get("If-Modified-Since"))
+    if matched:
+        record_not_modified()
+        headers["ETag"] = quote_etag(matched)
+        return current_app.response_class(status=304, headers=headers)
+
+    use_cache = use_cache and cache_enabled(current_app.debug)
+    entry = cache_get(key) if use_cache else None
+
+    if entry is not None:
+        response = current_app.response_class(entry.body, status=200, mimetype=entry.mimetype)
+        response.headers.update(entry.headers)
+        response.headers["X-Cache"] = "HIT"
+        g.cached_response = entry
+    else:
+        # Replica anahtardaki değişikliği henüz görmediyse sayfa primary'den
+        # okunur; aksi halde eski satırlar yeni ETag/anahtar altında saklanırdı
+        with read_staleness(staleness):
+            response = make_response(view(*args, **kwargs))
+
+        if use_cache:
+            if response.status_code == 200 and not response.direct_passthrough:
+                g.cached_response = cache_put(key, response.get_data(), response.mimetype)
+            response.headers["X-Cache"] = "MISS"
+
+    if response.status_code == 200:
+        response.headers.update(headers)
+
+    return response
+
+
+def cached_response(view):
+    """
+    Route'un 200 yanıtlarını cache'ler ve conditional GET uygular. Kategori
+    generation'ı için request.args['category'] kullanılır (yoksa tümü).
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        return _serve(view, args, kwargs, use_cache=True)
+
+    return wrapper
+
+
+def conditional_response(view):
+    """Sadece ETag / Last-Modified / 304 (yanıt cache'lenmez)."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        return _serve(view, args, kwargs, use_cache=False)
+
+    return wrapper
+
+
+def compress_response(response):
+    """
+    after_request: JSON yanıtlarını Accept-Encoding'e göre sıkıştırır.
+    Cache'ten gelen/cache'e yazılan yanıtlarda varyant kayıtta saklanır.
+    """
+    if response.mimetype != "application/json" or response.direct_passthrough:
+        return response
+
+    response.vary.add("Accept-Encoding")
+
+    if response.status_code != 200 or "Content-Encoding" in response.headers:
+        return response
+
+    body = response.get_data()
+    if not http_compression.should_compress(body):
+        return response
+
+    encoding = http_compression.negotiate(request.headers.get("Accept-Encoding"))
+    if encoding is None:
+        return response
+
+    entry = g.get("cached_response")
+    if entry is not None and entry.body == body:
+        response.set_data(entry.variant(encoding))
+    else:
+        response.set_data(http_compression.compress_body(body, encoding))
+
+    response.headers["Content-Encoding"] = encoding
+
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(http_compression.encoded_etag(etag, encoding), weak)
+
+    return response
+
+
+def get_cache_stats() -> dict:
+    stats = _cache.stats()
+    stats["ttl_seconds"] = cache_ttl()
+    return stats
+
+
+def clear_cache():
+    _cache.clear()
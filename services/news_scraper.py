@@ -174,6 +174,9 @@ class NewsScraper:
         
         unscraped = NewsModel.get_unscraped(limit=limit, exclude_blacklist=True)
         
+        # Makale başına is_blacklisted sorgusu yerine tek sorguda yükle
+        NewsModel.load_blacklist()
+        
         if not unscraped:
             logger.info("✨ Scrape edilecek haber kalmadı!")
             return stats
@@ -181,36 +184,24 @@ class NewsScraper:
         stats['total_attempted'] = len(unscraped)
         logger.info(f"🚀 {len(unscraped)} haber scraping başlatılıyor...")
         
-        for article in unscraped:
-            article_id = article['id']
-            url = article['url']
-            title = article['title']
-            
-            logger.info(f"📄 Scraping: {title[:50]}...")
-            
-            result = self.scrape_article(url, title)
-            
-            if result['success']:
-                cleaned_content = result['content']
-                cleaned_title = result['title'] or title
-                image = result.get('image') or article.get('image')
-                
-                NewsModel.update_full_content(article_id, cleaned_content, image)
-                NewsModel.update_title(article_id, cleaned_title)
-                
-                stats['successful'] += 1
-                logger.info(f"   ✅ Başarılı: {len(cleaned_content)} karakter (temizlendi)")
-            
-            else:
-                stats['failed'] += 1
-                error = result.get('error', 'unknown')
+        # Başarılı sonuçlar biriktirilip tek UPDATE ile yazılır
+        pending = []
+        last_flush = time.monotonic()
+        
+        try:
+            for article in unscraped:
+                self._scrape_one(article, pending, stats)
                 
-                if error == 'blacklisted':
-                    stats['blacklisted'] += 1
+                if pending and (
+                    len(pending) >= Config.SCRAPE_FLUSH_SIZE
+                    or time.monotonic() - last_flush >= Config.SCRAPE_FLUSH_INTERVAL
+                ):
+                    self._flush(pending)
+                    last_flush = time.monotonic()
                 
-                logger.warning(f"   ❌ Başarısız: {error}")
-            
-            time.sleep(1)
+                time.sleep(1)
+        finally:
+            self._flush(pending)
         
         logger.info("=" * 60)
         logger.info(f"🎉 SCRAPING BİTTİ")
@@ -220,6 +211,47 @@ class NewsScraper:
         logger.info("=" * 60)
         
         return stats
+    
+    def _flush(self, pending: list):
+        if not pending:
+            return
+        
+        updated = NewsModel.apply_scrape_results(pending)
+        logger.info(f"💾 {updated}/{len(pending)} haber içeriği yazıldı")
+        pending.clear()
+    
+    def _scrape_one(self, article: dict, pending: list, stats: dict):
+        article_id = article['id']
+        url = article['url']
+        title = article['title']
+        
+        logger.info(f"📄 Scraping: {title[:50]}...")
+        
+        result = self.scrape_article(url, title)
+        
+        if result['success']:
+            cleaned_content = result['content']
+            cleaned_title = result['title'] or title
+            image = result.get('image') or article.get('image')
+            
+            pending.append({
+                'id': article_id,
+                'content': cleaned_content,
+                'title': cleaned_title,
+                'image': image
+            })
+            
+            stats['successful'] += 1
+            logger.info(f"   ✅ Başarılı: {len(cleaned_content)} karakter (temizlendi)")
+        
+        else:
+            stats['failed'] += 1
+            error = result.get('error', 'unknown')
+            
+            if error == 'blacklisted':
+                stats['blacklisted'] += 1
+            
+            logger.warning(f"   ❌ Başarısız: {error}")
 
 
 def test_scraper():
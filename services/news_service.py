@@ -6,8 +6,9 @@ from services.news_fetcher import (
     fetch_newsdata,
     get_news_from_best_source
 )
-from services.duplicate_filter import remove_duplicates, filter_low_quality
+from services.duplicate_filter import remove_duplicates, filter_low_quality, filter_against_existing
 from models.news_models import NewsModel
+from models.db import PoolExhaustedError
 from utils.helpers import clean_news_title, clean_news_content, enhanced_clean_pipeline
 from config import Config
 import logging
@@ -101,6 +102,11 @@ class NewsService:
                     
                     cleaned_news.append(cleaned_item)
                 
+                # Diğer API'lerden gelmiş aynı haber (hash'i farklı) DB'de aranır
+                before_db_filter = len(cleaned_news)
+                cleaned_news = filter_against_existing(cleaned_news)
+                stats["duplicates"] += before_db_filter - len(cleaned_news)
+                
                 logger.info(f"   🧹 {len(cleaned_news)} haber temizlendi, kaydediliyor...")
                 
                 save_stats = NewsModel.save_bulk(
@@ -203,14 +209,37 @@ class NewsService:
         }
 
     @staticmethod
-    def clean_expired_news() -> dict:
+    def clean_expired_news(batched: bool = None) -> dict:
         tz = pytz.timezone(Config.TIMEZONE)
         start = datetime.now(tz)
 
         logger.info("🧹 Eski haber temizliği başlatılıyor...")
 
         try:
-            deleted = NewsModel.delete_expired()
+            result = {}
+
+            if NewsModel.is_partitioned():
+                # Tamamen süresi dolmuş günler tek DROP ile gider, maliyet hacimden bağımsız
+                result.update(NewsModel.drop_expired_partitions())
+                result["created_partitions"] = NewsModel.ensure_partitions()
+
+            if batched is None:
+                batched = Config.CLEANUP_BATCHED
+
+            # Partitioned modda sadece bugünün ve default partition'ın artıkları kalır
+            if batched:
+                batch_result = NewsModel.delete_expired_batched()
+                deleted = batch_result["deleted_count"]
+                result["chunks"] = batch_result["chunks"]
+                result["completed"] = batch_result["completed"]
+                if "error" in batch_result:
+                    result["error"] = batch_result["error"]
+            else:
+                deleted = NewsModel.delete_expired()
+
+            # DELETE'ler trigger'la sayılır, partition DROP sayılmaz → sayaçları eşitle
+            result["counter_drift"] = NewsModel.reconcile_counters().get("drift", 0)
+
             duration = (datetime.now(tz) - start).total_seconds()
 
             if deleted > 0:
@@ -218,22 +247,39 @@ class NewsService:
             else:
                 logger.info("✨ Silinecek eski haber yok.")
                 
-            return {"deleted_count": deleted, "duration_seconds": duration}
+            result.update({"deleted_count": deleted, "duration_seconds": duration})
+            return result
 
         except Exception as e:
             logger.error(f"❌ Temizlik hatası: {e}")
             return {"deleted_count": 0, "error": str(e)}
 
+    @staticmethod
+    def compress_stored_content() -> dict:
+        """
+        CONTENT_COMPRESSION açıksa düz metin olarak kalmış eski gövdeleri
+        zaman bütçesi içinde sıkıştırır (her gece kaldığı yerden devam eder).
+        """
+        if Config.CONTENT_COMPRESSION == "none":
+            return {"compressed": 0, "skipped": True}
+
+        try:
+            return NewsModel.compress_existing()
+        except Exception as e:
+            logger.error(f"❌ İçerik sıkıştırma hatası: {e}")
+            return {"compressed": 0, "error": str(e)}
+
     @staticmethod
     def get_system_status() -> dict:
         from services.api_manager import get_all_usage, get_daily_summary
 
         try:
-            total_news = NewsModel.get_total_count()
+            stats = NewsModel.get_stats()
+            total_news = stats["total"]
             latest_update = NewsModel.get_latest_update_time()
 
             by_category = {
-                c: NewsModel.count_by_category(c)
+                c: stats["by_category"][c]["total"]
                 for c in Config.NEWS_CATEGORIES
             }
 
@@ -244,13 +290,15 @@ class NewsService:
                     "total_news": total_news,
                     "latest_update": latest_update,
                     "by_category": by_category,
-                    "scraped_count": NewsModel.count_scraped(),
-                    "unscraped_count": NewsModel.count_unscraped()
+                    "scraped_count": stats["scraped"],
+                    "unscraped_count": stats["unscraped"]
                 },
                 "api_usage": get_all_usage(),
                 "api_summary": get_daily_summary()
             }
 
+        except PoolExhaustedError:
+            raise
         except Exception as e:
             logger.error(f"❌ Sistem durumu alınamadı: {e}")
             return {"status": "error", "error": str(e)}
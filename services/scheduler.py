@@ -195,6 +195,20 @@ def cleanup_job():
         logger.info("=" * 75)
         logger.info(f"✅ TEMİZLİK TAMAMLANDI")
         logger.info(f"🗑️  Silinen haber: {result.get('deleted_count', 0)}")
+        if "chunks" in result:
+            logger.info(
+                f"📦 Chunk: {result['chunks']}, "
+                f"tamamlandı: {'evet' if result.get('completed') else 'hayır (süre limiti)'}, "
+                f"süre: {result.get('duration_seconds', 0):.2f}s"
+            )
+        
+        compress_result = NewsService.compress_stored_content()
+        if not compress_result.get("skipped"):
+            logger.info(
+                f"🗜️  Sıkıştırılan içerik: {compress_result.get('compressed', 0)}"
+                f"{' (devam edecek)' if not compress_result.get('completed', True) else ''}"
+            )
+            result["compression"] = compress_result
         logger.info("=" * 75 + "\n")
         
         return result
@@ -0,0 +1,131 @@
+import re
+import struct
+import zlib
+import logging
+from collections import Counter
+from typing import Callable, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Blob başlığı: 1 byte codec etiketi + 4 byte (big-endian) sözlük id'si (0 = sözlüksüz)
+CODEC_TAGS = {"zlib": b"Z", "zstd": b"S"}
+TAG_CODECS = {v: k for k, v in CODEC_TAGS.items()}
+HEADER = struct.Struct(">cI")
+
+# zlib sadece son 32 KB'lık sözlüğü kullanabilir
+ZLIB_MAX_DICT_SIZE = 32 * 1024
+
+ZLIB_LEVEL = 9
+ZSTD_LEVEL = 10
+
+
+def resolve_codec(codec: str) -> Optional[str]:
+    """Config.CONTENT_COMPRESSION → kullanılabilir codec (none ise None)."""
+    codec = (codec or "none").lower()
+
+    if codec == "none":
+        return None
+
+    if codec == "zstd" and zstandard is None:
+        logger.warning("⚠️  zstandard paketi yok, zlib kullanılacak")
+        return "zlib"
+
+    if codec not in CODEC_TAGS:
+        logger.warning(f"⚠️  Bilinmeyen sıkıştırma: {codec}, zlib kullanılacak")
+        return "zlib"
+
+    return codec
+
+
+def train_dictionary(codec: str, samples: list, dict_size: int) -> bytes:
+    """
+    Örnek haber metinlerinden sıkıştırma sözlüğü üretir.
+    zstd: zstandard.train_dictionary; zlib: en sık kelime dizileri (sık olan sona).
+    """
+    encoded = [s.encode("utf-8") for s in samples if s]
+    if not encoded:
+        return b""
+
+    if codec == "zstd":
+        return zstandard.train_dictionary(dict_size, encoded).as_bytes()
+
+    # zlib için "eğitim": sık geçen 1-3 kelimelik öbekler; yakın mesafe daha
+    # ucuz kodlandığı için en sık olanlar sözlüğün sonuna konur
+    counts = Counter()
+    for text in samples:
+        words = re.findall(r"\w+[^\w\s]?", text)
+        for n in (1, 2, 3):
+            for i in range(len(words) - n + 1):
+                counts[" ".join(words[i:i + n])] += 1
+
+    limit = min(dict_size, ZLIB_MAX_DICT_SIZE)
+    chosen = []
+    size = 0
+    for phrase, count in counts.most_common():
+        if count < 2:
+            break
+        piece = phrase.encode("utf-8") + b" "
+        if size + len(piece) > limit:
+            continue
+        chosen.append(piece)
+        size += len(piece)
+
+    return b"".join(reversed(chosen))
+
+
+def compress(text: str, codec: str, dict_id: int = 0, dictionary: bytes = None) -> bytes:
+    data = text.encode("utf-8")
+
+    if codec == "zstd":
+        params = {"level": ZSTD_LEVEL}
+        if dictionary:
+            params["dict_data"] = zstandard.ZstdCompressionDict(dictionary)
+        payload = zstandard.ZstdCompressor(**params).compress(data)
+    else:
+        if dictionary:
+            obj = zlib.compressobj(ZLIB_LEVEL, zlib.DEFLATED, zlib.MAX_WBITS,
+                                   9, zlib.Z_DEFAULT_STRATEGY, dictionary)
+        else:
+            obj = zlib.compressobj(ZLIB_LEVEL)
+        payload = obj.compress(data) + obj.flush()
+
+    return HEADER.pack(CODEC_TAGS[codec], dict_id if dictionary else 0) + payload
+
+
+def decompress(blob, load_dictionary: Callable[[int], bytes] = None) -> Optional[str]:
+    """
+    compress() çıktısını metne çevirir. Sözlük gerekiyorsa
+    load_dictionary(dict_id) ile alınır.
+    """
+    if blob is None:
+        return None
+
+    blob = bytes(blob)
+    tag, dict_id = HEADER.unpack_from(blob)
+    payload = blob[HEADER.size:]
+    codec = TAG_CODECS.get(tag)
+
+    if codec is None:
+        raise ValueError(f"Bilinmeyen sıkıştırma etiketi: {tag!r}")
+
+    dictionary = load_dictionary(dict_id) if dict_id and load_dictionary else None
+    if dict_id and not dictionary:
+        raise ValueError(f"Sıkıştırma sözlüğü bulunamadı: {dict_id}")
+
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd ile sıkıştırılmış içerik için zstandard paketi gerekli")
+        params = {}
+        if dictionary:
+            params["dict_data"] = zstandard.ZstdCompressionDict(dictionary)
+        data = zstandard.ZstdDecompressor(**params).decompress(payload)
+    else:
+        obj = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        data = obj.decompress(payload) + obj.flush()
+
+    return data.decode("utf-8")
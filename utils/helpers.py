@@ -4,6 +4,7 @@ import logging
 from datetime import datetime, timedelta
 from typing import Optional, Callable, Any
 from functools import wraps
+from urllib.parse import urlsplit, parse_qsl, urlencode
 import pytz
 from config import Config
 
@@ -613,6 +614,60 @@ def sanitize_url(url: str) -> str:
     return url
 
 
+# Haberi tanımlamayan takip parametreleri (canonical_url'den atılır)
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "yclid", "dclid", "mc_cid", "mc_eid", "ref", "ref_src",
+    "amp", "outputtype", "_ga", "cmpid", "ito", "igshid", "spm", "share",
+}
+HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    URL'nin sağlayıcıdan bağımsız anahtarı: şema, www./m./amp. öneki,
+    fragment, takip parametreleri ve AMP varyantları atılır.
+    Sadece host küçük harfe çevrilir; path ve query büyük/küçük harfe duyarlı
+    olabildiği için korunur. news.canonical_url bu fonksiyonla hesaplanır.
+    """
+    if not url:
+        return ""
+
+    url = url.strip()
+    parts = urlsplit(url if "://" in url else "http://" + url)
+
+    # urlsplit().hostname zaten küçük harf
+    host = parts.hostname or ""
+    path = parts.path
+
+    # Google AMP cache: <x>.cdn.ampproject.org/c/s/example.com/haber
+    if host.endswith(".cdn.ampproject.org") or host == "cdn.ampproject.org":
+        match = re.match(r"^/[a-z](?:/s)?/([^/]+)(/.*)?$", path, re.IGNORECASE)
+        if match:
+            host, path = match.group(1).lower(), match.group(2) or ""
+
+    for prefix in HOST_PREFIXES:
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+
+    segments = [s for s in path.split("/") if s]
+    if segments and segments[-1].lower() == "amp":
+        segments.pop()
+    if segments and segments[0].lower() == "amp":
+        segments.pop(0)
+    path = re.sub(r"\.amp(\.html?)?$", r"\1", "/".join(segments), flags=re.IGNORECASE)
+
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")
+    )
+
+    canonical = host + ("/" + path if path else "")
+    if query:
+        canonical += "?" + urlencode(query)
+    return canonical
+
+
 def validate_category(category: str) -> bool:
     if not category:
         return False
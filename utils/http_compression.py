@@ -0,0 +1,65 @@
+import gzip
+import logging
+from typing import Optional
+from werkzeug.http import parse_accept_header
+from config import Config
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Eşit q değerinde soldaki tercih edilir
+ENCODINGS = tuple(
+    name for name, available in (
+        ("br", brotli is not None),
+        ("zstd", zstandard is not None),
+        ("gzip", True),
+    ) if available
+)
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """Accept-Encoding'e göre kullanılacak encoding (yoksa None = identity)."""
+    if not accept_encoding:
+        return None
+
+    accept = parse_accept_header(accept_encoding)
+    encoding = accept.best_match(ENCODINGS)
+
+    # "gzip;q=0" açıkça reddetmek demektir
+    if encoding is None or accept.quality(encoding) <= 0:
+        return None
+    return encoding
+
+
+def should_compress(body: bytes) -> bool:
+    return Config.RESPONSE_COMPRESSION and len(body) >= Config.COMPRESSION_MIN_SIZE
+
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    """
+    Tek bir COMPRESSION_LEVEL değeri her codec'in aralığına sıkıştırılır.
+    gzip mtime=0: aynı gövde her zaman aynı byte'lar (strong ETag için).
+    """
+    level = Config.COMPRESSION_LEVEL
+
+    if encoding == "br":
+        return brotli.compress(body, quality=max(0, min(level, 11)))
+
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor(level=max(1, min(level, 22))).compress(body)
+
+    return gzip.compress(body, compresslevel=max(1, min(level, 9)), mtime=0)
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Sıkıştırılmış temsilin ETag'i (tırnaksız)."""
+    return f"{etag}-{encoding}"
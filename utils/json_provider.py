@@ -0,0 +1,81 @@
+"""
+Flask JSON provider seçimi (Config.JSON_BACKEND: auto | orjson | stdlib).
+
+İki provider da datetime'ı ISO 8601 (datetime.isoformat() ile aynı) yazar;
+model katmanı satırları datetime olarak bırakır. Çıktı jsonify ile aynı
+zarfa sahiptir: sıralı anahtarlar, compact (debug'da girintili), sonda "\\n".
+"""
+from datetime import date
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+import logging
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class IsoJSONProvider(DefaultJSONProvider):
+    """stdlib json; Flask varsayılanından tek farkı tarihlerin ISO 8601 olması."""
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+
+def _orjson_default(o):
+    # datetime, date, UUID ve dataclass orjson'da yerleşik
+    if isinstance(o, Decimal):
+        return str(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    orjson ile serialize eder; string'ler kopyalanmadan UTF-8 yazılır
+    (ensure_ascii yok). dumps() separators gibi stdlib argümanlarını yok sayar.
+    """
+
+    mimetype = "application/json"
+    compact = None
+
+    def _dumps_bytes(self, obj, indent: bool = False) -> bytes:
+        option = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_orjson_default, option=option)
+
+    def dumps(self, obj, **kwargs) -> str:
+        return self._dumps_bytes(obj, indent=bool(kwargs.get("indent"))).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self._dumps_bytes(obj, indent=indent) + b"\n",
+            mimetype=self.mimetype
+        )
+
+
+def create_json_provider(app, backend: str = "auto") -> JSONProvider:
+    backend = (backend or "auto").lower()
+
+    if backend in ("auto", "orjson") and orjson is not None:
+        return OrjsonProvider(app)
+
+    if backend == "orjson":
+        logger.warning("⚠️  orjson paketi yok, stdlib json kullanılacak")
+    elif backend not in ("auto", "stdlib"):
+        logger.warning(f"⚠️  Bilinmeyen JSON_BACKEND: {backend}, stdlib json kullanılacak")
+
+    return IsoJSONProvider(app)
@@ -0,0 +1,38 @@
+from flask import current_app, jsonify
+from utils.raw_json import RawJSON
+from config import Config
+
+
+def sql_render_enabled() -> bool:
+    # Debug modda jsonify girintili yazar; SQL render sadece compact çıktı üretir
+    return Config.SQL_JSON_RENDER and not current_app.debug
+
+
+def json_response(payload: dict, status: int = 200):
+    """
+    jsonify ile aynı zarf (sort_keys, compact, sonda "\\n"); RawJSON değerler
+    yeniden parse/serialize edilmeden yerine konur.
+    """
+    if not has_raw_json(payload):
+        response = jsonify(payload)
+        response.status_code = status
+        return response
+
+    provider = current_app.json
+    body = render_json(provider, payload)
+    return current_app.response_class(body, status=status, mimetype=provider.mimetype)
+
+
+def has_raw_json(payload: dict) -> bool:
+    return any(isinstance(v, RawJSON) for v in payload.values())
+
+
+def render_json(provider, payload: dict) -> str:
+    """Compact JSON gövdesi (sonda "\\n"); ASGI yolu da aynı çıktıyı kullanır."""
+    parts = []
+    for key in sorted(payload):
+        value = payload[key]
+        encoded = value if isinstance(value, RawJSON) else provider.dumps(value, separators=(",", ":"))
+        parts.append(f"{provider.dumps(key)}:{encoded}")
+
+    return "{" + ",".join(parts) + "}\n"
@@ -0,0 +1,2 @@
+class RawJSON(str):
+    """Önceden serialize edilmiş JSON parçası; yanıta olduğu gibi yazılır."""